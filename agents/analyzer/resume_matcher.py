@@ -3,37 +3,99 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from shared.tools.base import BaseTool
-from shared.database.database import get_db_session, InternshipListing
+from shared.database.database import get_db_session, session_scope, InternshipListing
+from shared.database.writer import run_write
+from agents.analyzer.scoring import ScoringEngine
+from sqlalchemy import select, update, or_, bindparam
+import threading
 import re
 import json
 
+# FAANG and top companies
+TOP_COMPANIES = [
+    "google", "meta", "amazon", "apple", "microsoft", "netflix", "nvidia",
+    "openai", "anthropic", "stripe", "airbnb", "uber", "lyft", "doordash",
+    "coinbase", "robinhood", "palantir", "databricks", "snowflake", "figma",
+    "notion", "discord", "twitch", "spotify", "linkedin", "salesforce",
+    "adobe", "oracle", "ibm", "intel", "amd", "qualcomm", "tesla", "spacex"
+]
+
+# Default tech skills if no resume found
+DEFAULT_SKILLS = [
+    # Languages
+    "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "sql", "r",
+    # Web
+    "react", "angular", "vue", "node", "express", "django", "flask", "fastapi",
+    # Data/ML
+    "machine learning", "deep learning", "tensorflow", "pytorch", "pandas", "numpy",
+    "data science", "data analysis", "sql", "nosql", "mongodb", "postgresql",
+    # Cloud/DevOps
+    "aws", "azure", "gcp", "docker", "kubernetes", "ci/cd", "jenkins", "terraform",
+    # General
+    "git", "linux", "agile", "rest api", "microservices", "algorithms", "data structures"
+]
+
+# Common CS internship keywords
+KEYWORDS = [
+    "software engineer", "software developer", "swe", "backend", "frontend",
+    "full stack", "fullstack", "data engineer", "data scientist", "ml engineer",
+    "machine learning", "ai", "artificial intelligence", "devops", "cloud",
+    "mobile", "ios", "android", "web developer", "api", "infrastructure"
+]
+
+# Common tech skills to look for in a resume
+TECH_PATTERNS = [
+    r'\b(python|java|javascript|typescript|c\+\+|c#|golang|go|rust|ruby|php|swift|kotlin|scala)\b',
+    r'\b(react|angular|vue|svelte|next\.?js|node\.?js|express|django|flask|fastapi|spring|rails)\b',
+    r'\b(aws|azure|gcp|google cloud|docker|kubernetes|k8s|terraform|jenkins|ci/cd)\b',
+    r'\b(sql|mysql|postgresql|postgres|mongodb|redis|elasticsearch|dynamodb|firebase)\b',
+    r'\b(tensorflow|pytorch|keras|scikit-learn|pandas|numpy|matplotlib|opencv)\b',
+    r'\b(machine learning|deep learning|nlp|computer vision|data science|ai)\b',
+    r'\b(git|github|gitlab|linux|unix|bash|shell|vim|vscode)\b',
+    r'\b(rest|graphql|grpc|microservices|api|websocket)\b',
+    r'\b(agile|scrum|jira|confluence|kanban)\b',
+]
+
+
+def _pattern_terms(pattern):
+    """Every literal a \\b(a|b|...)\\b pattern can match, e.g. next\\.?js -> nextjs, next.js"""
+    terms = []
+    for alternative in pattern[3:-3].split('|'):
+        if '\\.?' in alternative:
+            terms.append(alternative.replace('\\.?', ''))
+            alternative = alternative.replace('\\.?', '.')
+        terms.append(alternative.replace('\\', ''))
+    return terms
+
+
+# Every skill a resume can produce; listing text is matched against all of
+# them once, so scoring a different resume doesn't match any text again
+SKILL_VOCABULARY = sorted(set(DEFAULT_SKILLS).union(*(_pattern_terms(p) for p in TECH_PATTERNS)))
+
+# Fingerprints with a background rescore running in this process
+_rescoring = set()
+_rescoring_lock = threading.Lock()
+
+
+def _scored_with_other(fingerprint):
+    """Listings scored with another fingerprint, as two ranges on the scored_with index (NULL matches neither)"""
+    column = InternshipListing.scored_with
+    return or_(column < fingerprint, column > fingerprint)
+
 class ResumeMatcher(BaseTool):
     name = "match_resume"
     description = "Score internships based on resume/skills match"
 
-    def __init__(self, resume_path=None):
+    def __init__(self, resume_path=None, profile=None):
         self.skills = []
         self.keywords = []
         self.resume_path = resume_path or os.path.expanduser("~/ai-agent/resume.txt")
+        self.profile = profile
         self._load_resume()
 
     def _load_resume(self):
         """Load and parse resume to extract skills"""
-        # Default tech skills if no resume found
-        default_skills = [
-            # Languages
-            "python", "java", "javascript", "typescript", "c++", "c#", "go", "rust", "sql", "r",
-            # Web
-            "react", "angular", "vue", "node", "express", "django", "flask", "fastapi",
-            # Data/ML
-            "machine learning", "deep learning", "tensorflow", "pytorch", "pandas", "numpy",
-            "data science", "data analysis", "sql", "nosql", "mongodb", "postgresql",
-            # Cloud/DevOps
-            "aws", "azure", "gcp", "docker", "kubernetes", "ci/cd", "jenkins", "terraform",
-            # General
-            "git", "linux", "agile", "rest api", "microservices", "algorithms", "data structures"
-        ]
-
+        self.resume_mtime = self._resume_mtime()
         try:
             if os.path.exists(self.resume_path):
                 with open(self.resume_path, 'r') as f:
@@ -43,75 +105,75 @@ class ResumeMatcher(BaseTool):
                     print(f"[ResumeMatcher] Loaded {len(self.skills)} skills from resume")
             else:
                 print(f"[ResumeMatcher] No resume found at {self.resume_path}, using default skills")
-                self.skills = default_skills
+                self.skills = DEFAULT_SKILLS
         except Exception as e:
             print(f"[ResumeMatcher] Error loading resume: {e}, using defaults")
-            self.skills = default_skills
-
-        # Common CS internship keywords
-        self.keywords = [
-            "software engineer", "software developer", "swe", "backend", "frontend",
-            "full stack", "fullstack", "data engineer", "data scientist", "ml engineer",
-            "machine learning", "ai", "artificial intelligence", "devops", "cloud",
-            "mobile", "ios", "android", "web developer", "api", "infrastructure"
-        ]
+            self.skills = DEFAULT_SKILLS
+
+        self.keywords = KEYWORDS
+
+        # Term matrices are shared across instances; this only sets up the weights
+        self.engine = ScoringEngine(
+            self.skills, self.keywords, TOP_COMPANIES, vocabulary=SKILL_VOCABULARY, profile=self.profile
+        )
+
+    def _resume_mtime(self):
+        try:
+            return os.path.getmtime(self.resume_path)
+        except OSError:
+            return None
 
     def _extract_skills(self, content):
         """Extract technical skills from resume content"""
-        # Common tech skills to look for
-        tech_patterns = [
-            r'\b(python|java|javascript|typescript|c\+\+|c#|golang|go|rust|ruby|php|swift|kotlin|scala)\b',
-            r'\b(react|angular|vue|svelte|next\.?js|node\.?js|express|django|flask|fastapi|spring|rails)\b',
-            r'\b(aws|azure|gcp|google cloud|docker|kubernetes|k8s|terraform|jenkins|ci/cd)\b',
-            r'\b(sql|mysql|postgresql|postgres|mongodb|redis|elasticsearch|dynamodb|firebase)\b',
-            r'\b(tensorflow|pytorch|keras|scikit-learn|pandas|numpy|matplotlib|opencv)\b',
-            r'\b(machine learning|deep learning|nlp|computer vision|data science|ai)\b',
-            r'\b(git|github|gitlab|linux|unix|bash|shell|vim|vscode)\b',
-            r'\b(rest|graphql|grpc|microservices|api|websocket)\b',
-            r'\b(agile|scrum|jira|confluence|kanban)\b',
-        ]
-
         found_skills = set()
-        for pattern in tech_patterns:
+        for pattern in TECH_PATTERNS:
             matches = re.findall(pattern, content, re.IGNORECASE)
             found_skills.update([m.lower() for m in matches])
 
         return list(found_skills) if found_skills else None
 
-    def execute(self, internship_ids=None, update_db=True):
-        """Score internships based on resume match"""
+    def execute(self, internship_ids=None, update_db=True, background=True):
+        """Score new internships; ones scored with another resume or scoring version are rescored in the background
+
+        Each score is stored with the engine's fingerprint in `scored_with`,
+        so a routine run only scores listings that have never been scored.
+        """
         try:
-            session = get_db_session()
+            if self._resume_mtime() != self.resume_mtime:
+                print("[ResumeMatcher] Resume changed, reloading skills")
+                self._load_resume()
 
+            engine = self.engine
             if internship_ids:
-                internships = session.query(InternshipListing).filter(
-                    InternshipListing.id.in_(internship_ids)
-                ).all()
+                condition = InternshipListing.id.in_(internship_ids)
             else:
-                # Score all unscored internships
-                internships = session.query(InternshipListing).filter(
-                    InternshipListing.relevance_score == 0.0
-                ).all()
-
-            print(f"[ResumeMatcher] Scoring {len(internships)} internships...")
-
-            scored_count = 0
-            for internship in internships:
-                score = self._calculate_score(internship)
-
-                if update_db:
-                    internship.relevance_score = score
-                    scored_count += 1
-
-            if update_db:
-                session.commit()
-
-            session.close()
+                condition = InternshipListing.scored_with.is_(None)
+            scored_count = self._score_where(engine, condition, update_db)
+
+            if not internship_ids and engine.should_retain():
+                # Deleted and archived listings no longer need term rows; the id scan
+                # only runs after the matrix has doubled, so routine runs skip it
+                with session_scope() as session:
+                    live_ids = session.execute(select(InternshipListing.id)).scalars().all()
+                engine.retain(live_ids)
+
+            rescoring = False
+            if not internship_ids and update_db:
+                # Existence probe: with nothing stale both index ranges are empty
+                with session_scope() as session:
+                    rescoring = session.execute(
+                        select(InternshipListing.id).where(_scored_with_other(engine.fingerprint)).limit(1)
+                    ).first() is not None
+                if rescoring:
+                    print("[ResumeMatcher] Internships were scored with a different resume or version, rescoring")
+                    self.rescore_stale(background=background)
 
             return {
                 "success": True,
                 "data": {
                     "scored_count": scored_count,
+                    "rescoring": rescoring,
+                    "scored_with": engine.fingerprint,
                     "skills_used": len(self.skills)
                 }
             }
@@ -120,49 +182,74 @@ class ResumeMatcher(BaseTool):
             print(f"[ResumeMatcher] Error: {e}")
             return {"success": False, "error": str(e)}
 
-    def _calculate_score(self, internship):
-        """Calculate relevance score for an internship (0-100)"""
-        score = 0
-        max_score = 100
-
-        # Combine title, company, location, description for matching
-        text = f"{internship.title} {internship.company} {internship.description or ''}".lower()
-
-        # Skill matching (60% of score)
-        skill_matches = 0
-        for skill in self.skills:
-            if skill.lower() in text:
-                skill_matches += 1
-
-        if self.skills:
-            skill_score = min(60, (skill_matches / len(self.skills)) * 100)
-        else:
-            skill_score = 30  # Default if no skills
-
-        # Keyword matching (25% of score)
-        keyword_matches = 0
-        for keyword in self.keywords:
-            if keyword.lower() in text:
-                keyword_matches += 1
-
-        keyword_score = min(25, (keyword_matches / len(self.keywords)) * 50)
-
-        # Company bonus (15% of score) - FAANG and top companies
-        top_companies = [
-            "google", "meta", "amazon", "apple", "microsoft", "netflix", "nvidia",
-            "openai", "anthropic", "stripe", "airbnb", "uber", "lyft", "doordash",
-            "coinbase", "robinhood", "palantir", "databricks", "snowflake", "figma",
-            "notion", "discord", "twitch", "spotify", "linkedin", "salesforce",
-            "adobe", "oracle", "ibm", "intel", "amd", "qualcomm", "tesla", "spacex"
+    def rescore_stale(self, background=True):
+        """Rescore every internship whose fingerprint isn't the current one
+
+        In the background this returns the thread (None if a rescore for this
+        fingerprint is already running); otherwise the number rescored.
+        """
+        engine = self.engine
+        condition = _scored_with_other(engine.fingerprint)
+        if not background:
+            return self._score_where(engine, condition)
+
+        with _rescoring_lock:
+            if engine.fingerprint in _rescoring:
+                return None
+            _rescoring.add(engine.fingerprint)
+
+        def _run():
+            try:
+                count = self._score_where(engine, condition)
+                print(f"[ResumeMatcher] Background rescore finished: {count} internships")
+            except Exception as e:
+                print(f"[ResumeMatcher] Background rescore failed: {e}")
+            finally:
+                with _rescoring_lock:
+                    _rescoring.discard(engine.fingerprint)
+
+        # Not a daemon: a short-lived script waits for the rescore at exit instead of killing it midway
+        thread = threading.Thread(target=_run, name="resume-rescore")
+        thread.start()
+        return thread
+
+    def _score_where(self, engine, condition, update_db=True, batch_size=2000):
+        """Score the internships matching condition and bulk-update score and fingerprint; returns how many were scored"""
+        with session_scope() as session:
+            internships = session.execute(
+                select(InternshipListing.id, InternshipListing.title, InternshipListing.company, InternshipListing.description)
+                .where(condition)
+            ).all()
+
+        print(f"[ResumeMatcher] Scoring {len(internships)} internships...")
+        if not internships or not update_db:
+            return 0
+
+        scores = self.score_listings(internships, engine)
+        rows = [
+            {"listing_id": internship.id, "score": float(score), "fingerprint": engine.fingerprint}
+            for internship, score in zip(internships, scores)
         ]
 
-        company_lower = internship.company.lower() if internship.company else ""
-        company_score = 15 if any(tc in company_lower for tc in top_companies) else 5
-
-        # Calculate final score
-        score = skill_score + keyword_score + company_score
-
-        return min(max_score, round(score, 1))
+        # Core UPDATE rather than ORM bulk update: rows archived meanwhile are skipped, not an error
+        table = InternshipListing.__table__
+        statement = update(table).where(table.c.id == bindparam("listing_id")).values(
+            relevance_score=bindparam("score"), scored_with=bindparam("fingerprint")
+        )
+
+        # One executemany UPDATE per batch, each its own short transaction on the serialized writer
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            run_write(lambda session, batch=batch: session.execute(statement, batch))
+        return len(rows)
+
+    def score_listings(self, internships, engine=None):
+        """Relevance scores (0-100) for internships, in order"""
+        return (engine or self.engine).score(
+            [internship.id for internship in internships],
+            [f"{internship.title} {internship.company} {internship.description or ''}" for internship in internships],
+            [internship.company or '' for internship in internships]
+        )
 
     def get_top_matches(self, limit=20):
         """Get top matching internships"""
@@ -194,7 +281,7 @@ if __name__ == "__main__":
     matcher = ResumeMatcher()
     print(f"Skills loaded: {matcher.skills[:10]}...")
 
-    result = matcher.execute()
+    result = matcher.execute(background=False)
     print(f"Result: {result}")
 
     top = matcher.get_top_matches(10)
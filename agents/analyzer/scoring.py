@@ -0,0 +1,255 @@
+"""Vectorized relevance scoring for ResumeMatcher
+
+Listing text is matched against a fixed term vocabulary once, into a sparse
+listings x terms occurrence matrix (TermMatrix). Scoring is then a single
+sparse matrix multiply: that matrix times a terms x 2 weight matrix whose
+columns pick out the resume's skills and the internship keywords. The
+vocabulary covers every skill a resume can yield, so a resume change only
+changes the weights and no listing text is matched again.
+
+Rows are kept per listing id and only built for listings (or text) the
+matrix hasn't seen yet. A row whose text changed, or whose listing is gone
+(see ScoringEngine.retain), is dead; once dead rows outnumber live ones
+the matrix is rebuilt without them.
+
+Each engine has a fingerprint (scoring version plus a hash of the skills,
+keywords, companies and profile) that is stored with every score as
+`scored_with`, so stale scores can be found and recomputed.
+
+    engine = ScoringEngine(skills, keywords, companies, vocabulary=SKILL_VOCABULARY)
+    scores = engine.score(ids, texts, company_names)   # numpy array, 0-100
+"""
+import os
+import json
+import hashlib
+import threading
+from array import array
+from functools import lru_cache
+
+import numpy as np
+from scipy import sparse
+
+from shared.tools.keyword_matcher import KeywordMatcher
+
+SCORING_VERSION = 2  # Bump whenever scores would come out differently, so stored ones get recomputed
+
+
+def _normalize(terms):
+    """Lowercased terms with single spaces, deduplicated, the way KeywordMatcher stores them"""
+    return sorted({" ".join(term.lower().split()) for term in terms or [] if term.strip()})
+
+
+class ScoringProfile:
+    """How the 0-100 score is split between skill, keyword and company matches
+
+    skill score    min(skills, matched skills / resume skills * skill_scale)
+    keyword score  min(keywords, matched keywords / keywords * keyword_scale)
+    company score  company for a top company, company_base otherwise
+    """
+
+    def __init__(self, skills=60, keywords=25, company=15, skill_scale=100, keyword_scale=50,
+                 company_base=5, no_skills=None):
+        # Floats, so the same weights always give the same engine fingerprint
+        self.skills = float(skills)
+        self.keywords = float(keywords)
+        self.company = float(company)
+        self.skill_scale = float(skill_scale)
+        self.keyword_scale = float(keyword_scale)
+        self.company_base = float(min(company_base, company))
+        self.no_skills = float(no_skills if no_skills is not None else skills / 2)  # Skill score with no resume skills
+
+    @classmethod
+    def from_env(cls):
+        """Default profile, with a SCORING_WEIGHTS="skills,keywords,company" override"""
+        weights = os.getenv("SCORING_WEIGHTS")
+        skills, keywords, company = (float(w) for w in weights.split(",")) if weights else (60, 25, 15)
+        return cls(skills, keywords, company)
+
+
+class TermMatrix:
+    """Sparse listing x term occurrence matrix for a fixed vocabulary, extended as listings arrive"""
+
+    COMPACT_MIN_DEAD = 1000  # Never rebuild for fewer dead rows than this
+
+    def __init__(self, vocabulary):
+        self.matcher = KeywordMatcher(vocabulary)
+        self.terms = self.matcher.keywords
+        self.columns = {term: i for i, term in enumerate(self.terms)}
+        self._implied = self._implied_columns()
+
+        self._rows = {}  # listing id -> (row, hash of its text)
+        self._indptr = array("q", [0])
+        self._indices = array("i")
+        self._dead = 0  # Rows no listing id points at any more
+        self._retained = 0  # Listings kept by the last retain()
+        self._matrix = None  # CSR of every row built so far; rebuilt after updates
+        self._lock = threading.Lock()
+
+    def _implied_columns(self):
+        """Columns a hit on each term counts for: itself and any shorter term inside it
+
+        The matcher takes the longest term at each position, so "rest api"
+        also has to count as "rest" and "api".
+        """
+        single = [KeywordMatcher([term]) for term in self.terms]
+        return {
+            term: [column for column, matcher in enumerate(single) if matcher.search(term)]
+            for term in self.terms
+        }
+
+    def update(self, ids, texts):
+        """Match text for listings that are new or whose text changed"""
+        with self._lock:
+            self._update(ids, texts)
+            self._compact_if_sparse()
+
+    def match(self, ids, texts):
+        """update() then rows() in one step, so no retain() can drop an id in between"""
+        with self._lock:
+            self._update(ids, texts)
+            self._compact_if_sparse()
+            return self._select(ids)
+
+    def retain(self, ids):
+        """Forget every listing not in ids (deleted or archived); returns how many were dropped"""
+        keep = set(ids)
+        with self._lock:
+            gone = [listing_id for listing_id in self._rows if listing_id not in keep]
+            for listing_id in gone:
+                del self._rows[listing_id]
+            self._dead += len(gone)
+            self._retained = len(self._rows)
+            self._compact_if_sparse()
+        return len(gone)
+
+    def should_retain(self):
+        """True once the matrix holds twice the listings the last retain() kept (and at least COMPACT_MIN_DEAD)
+
+        Checking which listings are still active costs a read of every id,
+        so it's only worth doing after the matrix has grown by as many rows.
+        """
+        return len(self._rows) > max(self.COMPACT_MIN_DEAD, 2 * self._retained)
+
+    def _update(self, ids, texts):
+        for listing_id, text in zip(ids, texts):
+            key = hash(text)
+            known = self._rows.get(listing_id)
+            if known is not None:
+                if known[1] == key:
+                    continue
+                self._dead += 1  # Its old row is replaced below
+
+            columns = set()
+            for hit in self.matcher.matches(text):
+                columns.update(self._implied.get(hit, ()))
+
+            self._rows[listing_id] = (len(self._indptr) - 1, key)
+            self._indices.extend(sorted(columns))
+            self._indptr.append(len(self._indices))
+            self._matrix = None
+
+    def _compact_if_sparse(self):
+        """Rebuild the arrays from live rows only, once dead rows outnumber them"""
+        if self._dead <= max(self.COMPACT_MIN_DEAD, len(self._rows)):
+            return
+
+        indptr, indices, rows = array("q", [0]), array("i"), {}
+        for listing_id, (row, key) in sorted(self._rows.items(), key=lambda item: item[1][0]):
+            rows[listing_id] = (len(indptr) - 1, key)
+            indices.extend(self._indices[self._indptr[row]:self._indptr[row + 1]])
+            indptr.append(len(indices))
+
+        self._rows, self._indptr, self._indices = rows, indptr, indices
+        self._dead = 0
+        self._matrix = None
+
+    def __len__(self):
+        """Rows held, live and dead"""
+        return len(self._indptr) - 1
+
+    def _all_rows(self):
+        if self._matrix is None:
+            # Copies: a view would pin the arrays and stop update() from appending
+            indptr = np.array(self._indptr, dtype=np.int64)
+            indices = np.array(self._indices, dtype=np.int32)
+            self._matrix = sparse.csr_matrix(
+                (np.ones(len(indices), dtype=np.float32), indices, indptr),
+                shape=(len(indptr) - 1, len(self.terms))
+            )
+        return self._matrix
+
+    def rows(self, ids):
+        """Occurrence matrix for already-added listings, one row per id in order"""
+        with self._lock:
+            return self._select(ids)
+
+    def _select(self, ids):
+        rows = np.fromiter((self._rows[listing_id][0] for listing_id in ids), dtype=np.int64, count=len(ids))
+        return self._all_rows()[rows]
+
+
+@lru_cache(maxsize=8)
+def get_term_matrix(vocabulary):
+    """Process-wide TermMatrix for a vocabulary (tuple of terms)"""
+    return TermMatrix(vocabulary)
+
+
+class ScoringEngine:
+    """Scores listings for one set of resume skills"""
+
+    def __init__(self, skills, keywords, companies, vocabulary=(), profile=None):
+        self.profile = profile or ScoringProfile.from_env()
+        self.skills = _normalize(skills)
+        self.keywords = _normalize(keywords)
+        self.companies = _normalize(companies)
+        self.text_terms = get_term_matrix(tuple(_normalize([*vocabulary, *self.skills, *self.keywords])))
+        self.company_terms = get_term_matrix(tuple(self.companies))
+        self.fingerprint = self._fingerprint()
+
+    def _fingerprint(self):
+        """Scoring version plus a hash of everything else a score depends on"""
+        inputs = json.dumps([self.skills, self.keywords, self.companies, vars(self.profile)], sort_keys=True)
+        return f"v{SCORING_VERSION}-{hashlib.sha256(inputs.encode()).hexdigest()[:16]}"
+
+    def should_retain(self):
+        """True once the term matrices have grown enough since the last retain() to be worth pruning"""
+        return self.text_terms.should_retain()
+
+    def retain(self, ids):
+        """Drop term rows of listings not in ids (all active listing ids); returns how many listings"""
+        self.company_terms.retain(ids)
+        return self.text_terms.retain(ids)
+
+    def _weights(self):
+        """terms x 2 matrix: column 0 selects resume skills, column 1 keywords"""
+        columns = self.text_terms.columns
+        weights = np.zeros((len(columns), 2), dtype=np.float32)
+        weights[[columns[term] for term in self.skills], 0] = 1
+        weights[[columns[term] for term in self.keywords], 1] = 1
+        return weights
+
+    def score(self, ids, texts, companies):
+        """0-100 relevance score per listing, as a numpy array in input order"""
+        if not ids:
+            return np.zeros(0)
+
+        text_rows = self.text_terms.match(ids, texts)
+        company_rows = self.company_terms.match(ids, companies)
+
+        profile = self.profile
+        matches = text_rows @ self._weights()
+        top_company = company_rows.getnnz(axis=1) > 0
+
+        if self.skills:
+            skill_score = np.minimum(profile.skills, matches[:, 0] / len(self.skills) * profile.skill_scale)
+        else:
+            skill_score = np.full(len(ids), profile.no_skills)
+
+        if self.keywords:
+            keyword_score = np.minimum(profile.keywords, matches[:, 1] / len(self.keywords) * profile.keyword_scale)
+        else:
+            keyword_score = np.zeros(len(ids))
+
+        company_score = np.where(top_company, profile.company, profile.company_base)
+
+        return np.minimum(100, np.round(skill_score + keyword_score + company_score, 1))
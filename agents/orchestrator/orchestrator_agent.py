@@ -25,59 +25,43 @@ class OrchestratorAgent(BaseTool):
         try:
             print(f"[Orchestrator] 🚀 Starting proven workflow...")
             
-            # Step 1: GitHub Discovery (PROVEN TO WORK)
-            print(f"[Orchestrator] Step 1: GitHub Discovery")
-            discovery = self.github_monitor.execute(repos=repos or ["SimplifyJobs", "Pitt-CSC", "SpeedyApply"], limit=500)
-            
-            if not discovery["success"]:
-                return {"success": False, "error": f"Discovery failed: {discovery.get('error')}"}
-            
-            total_found = discovery["data"]["total_internships"]
-            print(f"[Orchestrator] ✅ Discovered {total_found} internships")
-            
-            # Step 2: Extract Sample Internships for Saving
-            all_samples = []
-            for repo_data in discovery["data"]["repo_data"]:
-                all_samples.extend(repo_data["sample_internships"])
-            
-            if not all_samples:
-                return {"success": True, "data": {"message": "No internships to save"}}
-            
-            # Step 3: Database Saving (PROVEN TO WORK) 
-            print(f"[Orchestrator] Step 2: Database Saving ({len(all_samples)} internships)")
-            
-            # Format internships correctly (matching the working format)
-            formatted_internships = []
-            for internship in all_samples:
-                formatted_internships.append({
-                    'company': internship['company'],
-                    'position': internship['position'],
-                    'location': internship['location'],
-                    'url': internship['url'],
-                    'source': internship['source'],
-                    'age_days': internship.get('age_days')
-                })
-            
-            db_result = self.database_tool.execute(
-                internships=formatted_internships,
+            # Step 1 + 2: GitHub Discovery streamed into Database Saving
+            # Listings are written in chunks as each repo finishes parsing,
+            # while the remaining repos are still downloading
+            print(f"[Orchestrator] Step 1: GitHub Discovery → Database Saving (streaming)")
+            listings = self.github_monitor.iter_listings(
+                repos=repos or ["SimplifyJobs", "Pitt-CSC", "SpeedyApply"],
+                limit=500
+            )
+
+            db_result = self.database_tool.save_stream(
+                listings,
                 agent_job_id=agent_job_id or "orchestrator"
             )
-            
+
             if not db_result["success"]:
                 return {"success": False, "error": f"Database save failed: {db_result.get('error')}"}
-            
+
+            total_found = db_result["data"]["total_processed"]
+            print(f"[Orchestrator] ✅ Discovered {total_found} internships")
+
+            if not total_found:
+                return {"success": True, "data": {"message": "No internships to save"}}
+
             saved_count = db_result["data"]["saved_count"]
             duplicate_count = db_result["data"]["duplicate_count"]
             print(f"[Orchestrator] ✅ Saved {saved_count} new internships ({duplicate_count} duplicates)")
 
-            # Step 4: Resume Matching - Score internships
-            print(f"[Orchestrator] Step 3: Resume Matching")
+            # Step 3: Resume Matching - Score internships
+            print(f"[Orchestrator] Step 2: Resume Matching")
             match_result = self.resume_matcher.execute()
             scored_count = match_result.get("data", {}).get("scored_count", 0) if match_result["success"] else 0
             print(f"[Orchestrator] ✅ Scored {scored_count} internships based on resume")
+            if match_result["success"] and match_result["data"]["rescoring"]:
+                print(f"[Orchestrator] Rescoring older scores in the background (resume or scoring changed)")
 
-            # Step 5: Success Summary Email
-            print(f"[Orchestrator] Step 4: Success Summary")
+            # Step 4: Success Summary Email
+            print(f"[Orchestrator] Step 3: Success Summary")
             summary = f"""ORCHESTRATED WORKFLOW SUCCESS ✅
 
 🔍 GitHub Discovery: {total_found} internships found
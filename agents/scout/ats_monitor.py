@@ -3,18 +3,36 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from shared.tools.base import BaseTool
-import requests
+from shared.database.ats_jobs import record_ats_poll
+from shared.tools.rate_limit import HostRateLimiter, parse_retry_after
+from shared.tools.parse_cache import ParseCache, content_key
+from shared.tools.http_cache import get_cache_dir
+from shared.tools.keyword_matcher import KeywordMatcher
+from shared.tools.http_client import get_http_client
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import hashlib
+import html
 import json
-import time
 from datetime import datetime
 
+# Job titles that indicate an internship ("Summer2026 Intern" counts, hence digits=True).
+# Plurals are listed rather than suffixed, so "fall" doesn't match "Niagara Falls".
+INTERNSHIP_KEYWORDS = KeywordMatcher([
+    'intern', 'interns', 'internship', 'internships', 'co-op', 'co-ops', 'coop', 'coops',
+    'student', 'students', 'summer', 'fall', 'spring', 'new grad', 'new grads', 'graduate', 'graduates',
+    'undergraduate', 'undergraduates', 'undergrad', 'undergrads'
+], digits=True)
+
+# Greenhouse Job Board API: /{board}/jobs is a lightweight index, /{board}/jobs/{id} has the full content
+GREENHOUSE_API = "https://boards-api.greenhouse.io/v1/boards"
+
 class ATSMonitorTool(BaseTool):
     name = "monitor_ats"
     description = "Monitor ATS systems (Greenhouse, Lever) for new postings. Args: {'companies': ['company1', 'company2'], 'ats_type': 'greenhouse'}"
     
     def __init__(self):
-        # Companies with known ATS endpoints (base URLs without /jobs)
+        # Companies with known Greenhouse boards (the last path segment is the board token)
         self.greenhouse_companies = {
             'stripe': 'https://boards.greenhouse.io/stripe',
             'reddit': 'https://boards.greenhouse.io/reddit', 
@@ -26,6 +44,35 @@ class ATSMonitorTool(BaseTool):
             'notion': 'https://boards.greenhouse.io/notion'
         }
 
+        # Realistic browser headers
+        self.headers = {
+            'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'Accept': 'application/json',
+            'Accept-Language': 'en-US,en;q=0.9',
+            'Accept-Encoding': 'gzip, deflate, br',
+            'Connection': 'keep-alive',
+            'Upgrade-Insecure-Requests': '1'
+        }
+
+        # Rate limiting - be respectful: requests per second and burst per host
+        self.rate_limiter = HostRateLimiter(
+            rate=float(os.getenv("ATS_HOST_RATE", "2")),
+            burst=int(os.getenv("ATS_HOST_BURST", "4"))
+        )
+        # Requests in flight at once, board indexes and job descriptions together
+        self.max_concurrency = int(os.getenv("ATS_MAX_CONCURRENCY", "8"))
+        self._in_flight = threading.BoundedSemaphore(self.max_concurrency)
+        # 429/503 are handled below with the rate limiter, so the client doesn't retry them itself
+        self.http = get_http_client("ats", retry_statuses=(500, 502, 504), retry_after=False,
+                                    pool_size=self.max_concurrency * 2)
+        self.max_retries = int(os.getenv("ATS_MAX_RETRIES", "3"))
+
+        # Full job descriptions, keyed by board, job id and its updated_at
+        self.descriptions = ParseCache(
+            cache_dir=os.path.join(get_cache_dir(), "ats_descriptions"),
+            ttl=int(os.getenv("ATS_DESCRIPTION_TTL_SECONDS", str(7 * 86400)))
+        )
+
     def execute(self, companies=None, ats_type="greenhouse", check_internships_only=True):
         """Monitor ATS endpoints for new job postings"""
         try:
@@ -46,56 +93,38 @@ class ATSMonitorTool(BaseTool):
                 print(f"[ATSMonitor] Filtering to companies: {list(company_urls.keys())}")
             
             results = []
-            
-            for company, base_url in company_urls.items():
-                try:
-                    print(f"[ATSMonitor] Checking {company}...")
-                    
-                    # Construct full URL with /jobs?format=json
-                    full_url = base_url + '/jobs?format=json'
-                    print(f"[ATSMonitor] URL: {full_url}")
-                    
-                    # Make request with realistic headers
-                    headers = {
-                        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-                        'Accept': 'application/json',
-                        'Accept-Language': 'en-US,en;q=0.9',
-                        'Accept-Encoding': 'gzip, deflate, br',
-                        'Connection': 'keep-alive',
-                        'Upgrade-Insecure-Requests': '1'
-                    }
-                    
-                    response = requests.get(full_url, headers=headers, timeout=15)
-                    
-                    print(f"[ATSMonitor] {company}: HTTP {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        try:
-                            data = response.json()
-                            jobs = self._extract_jobs(data, company, check_internships_only)
-                            results.extend(jobs)
-                            
-                            print(f"[ATSMonitor] {company}: Found {len(jobs)} internships")
-                        except json.JSONDecodeError as e:
-                            print(f"[ATSMonitor] {company}: Invalid JSON response - {str(e)}")
+            failed = []
+
+            # Companies are polled concurrently; politeness comes from the
+            # per-host token bucket rather than a sleep between companies.
+            # Description fetches get their own pool so board workers can wait on them;
+            # both pools share one cap on requests in flight (see _get_json).
+            with ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="ats-monitor") as pool, \
+                    ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="ats-hydrate") as hydrate_pool:
+                pending = {
+                    company: pool.submit(self._poll_company, company, base_url, check_internships_only, hydrate_pool)
+                    for company, base_url in company_urls.items()
+                }
+
+                for company, future in pending.items():
+                    try:
+                        jobs = future.result()
+                    except Exception as e:
+                        print(f"[ATSMonitor] Error checking {company}: {str(e)}")
+                        jobs = None
+
+                    if jobs is None:
+                        failed.append(company)
                     else:
-                        print(f"[ATSMonitor] {company}: Failed to fetch data - Status {response.status_code}")
-                        # Print first 200 chars of response for debugging
-                        print(f"[ATSMonitor] Response preview: {response.text[:200]}")
-                    
-                    # Rate limiting - be respectful
-                    time.sleep(3)
-                    
-                except Exception as e:
-                    print(f"[ATSMonitor] Error checking {company}: {str(e)}")
-                    continue
-            
+                        results.extend(jobs)
+
             return {
                 "success": True,
                 "data": {
                     "jobs_found": len(results),
                     "jobs": results,
-                    "companies_checked": list(company_urls.keys())
+                    "companies_checked": list(company_urls.keys()),
+                    "companies_failed": failed
                 }
             }
             
@@ -105,19 +134,106 @@ class ATSMonitorTool(BaseTool):
                 "error": str(e)
             }
     
+    def _get_json(self, url, label):
+        """GET url as JSON, retrying on 429/503 as the host allows; None if it failed"""
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(url)
+            with self._in_flight:
+                response = self.http.get(url, headers=self.headers, timeout=15)
+
+            if response.status_code in (429, 503) and attempt < self.max_retries:
+                # Honour Retry-After, otherwise back off exponentially; the host's rate is halved either way
+                delay = parse_retry_after(response.headers.get('Retry-After'), default=2 ** (attempt + 1))
+                print(f"[ATSMonitor] {label}: throttled, retrying in {delay:.1f}s")
+                self.rate_limiter.backoff(url, delay)
+                continue
+            break
+
+        if response.status_code != 200:
+            print(f"[ATSMonitor] {label}: Failed to fetch data - Status {response.status_code}")
+            # Print first 200 chars of response for debugging
+            print(f"[ATSMonitor] Response preview: {response.text[:200]}")
+            return None
+
+        self.rate_limiter.success(url)
+        try:
+            return response.json()
+        except json.JSONDecodeError as e:
+            print(f"[ATSMonitor] {label}: Invalid JSON response - {str(e)}")
+            return None
+
+    def _poll_company(self, company, base_url, internships_only=True, hydrate_pool=None):
+        """Fetch one company's board in two phases; None if the board couldn't be fetched
+
+        1. The job index (ids, titles, locations, no descriptions) is filtered by title.
+        2. Descriptions are fetched only for matching jobs not in the description cache.
+        """
+        print(f"[ATSMonitor] Checking {company}...")
+
+        board = base_url.rstrip('/').rsplit('/', 1)[-1]
+        index_url = f"{GREENHOUSE_API}/{board}/jobs"
+        print(f"[ATSMonitor] URL: {index_url}")
+
+        data = self._get_json(index_url, company)
+        if data is None:
+            return None
+
+        jobs = self._extract_jobs(data, company, internships_only)
+        print(f"[ATSMonitor] {company}: Found {len(jobs)} internships")
+
+        self._hydrate(board, jobs, hydrate_pool)
+        return jobs
+
+    def _hydrate(self, board, jobs, pool=None):
+        """Fill in description and department from cache or, on a cache miss, the job endpoint"""
+        to_fetch = []
+        for job in jobs:
+            key = content_key(f"{board}/{job['ats_id']}/{job.pop('updated_at', '')}", "greenhouse")
+            cached = self.descriptions.get(key)
+            if cached is not None:
+                job.update(cached)
+            elif job['ats_id']:
+                to_fetch.append((job, key))
+
+        if not to_fetch:
+            return
+
+        def _fetch(job, key):
+            detail = self._get_json(f"{GREENHOUSE_API}/{board}/jobs/{job['ats_id']}", f"{job['company']} job {job['ats_id']}")
+            if detail is None:
+                return
+            content = html.unescape(detail.get('content') or '')
+            details = {
+                'description': content[:500] + "..." if content else '',
+                'department': detail.get('departments', [{}])[0].get('name', '') if detail.get('departments') else ''
+            }
+            self.descriptions.put(key, details)
+            job.update(details)
+
+        print(f"[ATSMonitor] {jobs[0]['company']}: Fetching {len(to_fetch)} job descriptions")
+        if pool is None:
+            for job, key in to_fetch:
+                _fetch(job, key)
+        else:
+            for future in [pool.submit(_fetch, job, key) for job, key in to_fetch]:
+                future.result()
+
     def _extract_jobs(self, data, company, internships_only=True):
-        """Extract job data from Greenhouse response"""
+        """Extract job data from a Greenhouse job index (no descriptions)"""
         jobs = []
         
         try:
             job_list = data.get('jobs', [])
             print(f"[ATSMonitor] {company}: Processing {len(job_list)} total jobs")
             
-            for job in job_list:
+            # Classify every title in one call
+            keyword_hits = INTERNSHIP_KEYWORDS.classify([job.get('title', '') for job in job_list])
+            
+            for job, hits in zip(job_list, keyword_hits):
                 title = job.get('title', '')
                 
                 # Filter for internships if requested
-                if internships_only and not self._is_internship(title):
+                if internships_only and not hits:
                     continue
                 
                 jobs.append({
@@ -125,11 +241,13 @@ class ATSMonitorTool(BaseTool):
                     'company': company,
                     'location': job.get('location', {}).get('name', '') if isinstance(job.get('location'), dict) else str(job.get('location', '')),
                     'url': job.get('absolute_url', ''),
-                    'department': job.get('departments', [{}])[0].get('name', '') if job.get('departments') else '',
+                    'department': '',
                     'ats_source': 'greenhouse',
                     'ats_id': str(job.get('id', '')),
                     'discovered_at': datetime.utcnow().isoformat(),
-                    'description': job.get('content', '')[:500] + "..." if job.get('content') else ''
+                    'description': '',
+                    'matched_keywords': sorted(hits),
+                    'updated_at': job.get('updated_at', '')  # Cache key for the description; removed by _hydrate
                 })
                     
         except Exception as e:
@@ -139,9 +257,7 @@ class ATSMonitorTool(BaseTool):
     
     def _is_internship(self, title):
         """Check if job title indicates an internship"""
-        intern_keywords = ['intern', 'internship', 'co-op', 'coop', 'student', 'summer', 'fall', 'spring', 'new grad', 'graduate']
-        title_lower = title.lower()
-        return any(keyword in title_lower for keyword in intern_keywords)
+        return INTERNSHIP_KEYWORDS.search(title)
 
 
 class ATSChangeDetectorTool(BaseTool):
@@ -151,8 +267,6 @@ class ATSChangeDetectorTool(BaseTool):
     def execute(self, companies=None):
         """Detect changes in job postings"""
         try:
-            from database import get_db_session, InternshipListing
-            
             # Get current ATS data
             ats_monitor = ATSMonitorTool()
             results = ats_monitor.execute(companies, "greenhouse")
@@ -161,20 +275,16 @@ class ATSChangeDetectorTool(BaseTool):
                 return results
             
             all_jobs = results["data"]["jobs"]
+            failed = set(results["data"]["companies_failed"])
+            polled = [company for company in results["data"]["companies_checked"] if company not in failed]
             
-            # Check against database for truly new postings
-            session = get_db_session()
-            new_jobs = []
-            
-            for job in all_jobs:
-                # Check if we've seen this job before by URL
-                existing = session.query(InternshipListing).filter_by(url=job['url']).first()
-                
-                if not existing:
-                    new_jobs.append(job)
-                    print(f"[ATSChangeDetector] 🚨 NEW: {job['title']} at {job['company']}")
+            # Diff this poll against the seen-id table: one bulk read, one bulk write
+            new_jobs, removed_jobs = record_ats_poll(all_jobs, polled, ats_source="greenhouse")
             
-            session.close()
+            for job in new_jobs:
+                print(f"[ATSChangeDetector] 🚨 NEW: {job['title']} at {job['company']}")
+            if removed_jobs:
+                print(f"[ATSChangeDetector] {len(removed_jobs)} postings removed since last check")
             
             return {
                 "success": True,
@@ -182,6 +292,11 @@ class ATSChangeDetectorTool(BaseTool):
                     "total_jobs_found": len(all_jobs),
                     "new_jobs": len(new_jobs),
                     "new_postings": new_jobs,
+                    "removed_jobs": len(removed_jobs),
+                    "removed_postings": [
+                        {'company': job['company'], 'ats_id': job['ats_id'], 'first_seen': job['first_seen'].isoformat()}
+                        for job in removed_jobs
+                    ],
                     "alert_needed": len(new_jobs) > 0
                 }
             }
@@ -3,32 +3,30 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from shared.tools.base import BaseTool
-from shared.database.database import get_db_session, InternshipListing
-import requests
+from shared.database.database import session_scope
+from shared.tools.database import fetch_existing_keys
+from shared.tools.http_cache import HTTPValidatorCache
+from shared.tools.parse_cache import ParseCache, content_key
+from shared.tools.http_client import get_http_client
+from agents.scout.readme_diff import ReadmeSnapshotStore, diff_readme, select_listings
+from agents.scout.readme_parser import get_parser
+from agents.scout.repo_registry import load_repos
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import json
 from datetime import datetime
 import hashlib
-import re
 
 class GitHubInternshipMonitor(BaseTool):
     name = "monitor_github_internships"
     description = "Monitor GitHub internship repos for new postings. Args: {'repos': ['SimplifyJobs', 'Pitt-CSC', 'SpeedyApply']}"
 
     def __init__(self):
-        self.repos = {
-            'SimplifyJobs': {
-                'url': 'https://api.github.com/repos/SimplifyJobs/Summer2026-Internships/commits',
-                'raw_url': 'https://raw.githubusercontent.com/SimplifyJobs/Summer2026-Internships/dev/README.md'
-            },
-            'Pitt-CSC': {
-                'url': 'https://api.github.com/repos/pittcsc/Summer2026-Internships/commits',
-                'raw_url': 'https://raw.githubusercontent.com/pittcsc/Summer2026-Internships/dev/README.md'
-            },
-            'SpeedyApply': {
-                'url': 'https://api.github.com/repos/speedyapply/2026-SWE-College-Jobs/commits',
-                'raw_url': 'https://raw.githubusercontent.com/speedyapply/2026-SWE-College-Jobs/main/README.md'
-            }
-        }
+        self.http = get_http_client()
+        self.validators = HTTPValidatorCache()
+        self.snapshots = ReadmeSnapshotStore()
+        self.parse_cache = ParseCache()
+        self.max_workers = int(os.getenv("GITHUB_MAX_WORKERS", "6"))
+        self.repos = load_repos()
 
     def execute(self, repos=None, check_recent_commits=True, limit=500):
         """Monitor GitHub internship repos for updates"""
@@ -41,17 +39,24 @@ class GitHubInternshipMonitor(BaseTool):
                 selected_repos = self.repos
 
             results = []
-
-            for repo_name, repo_info in selected_repos.items():
-                try:
+            if not check_recent_commits:
+                selected_repos = {}
+
+            # Commits and README requests for every repo run concurrently; each
+            # README is parsed on its worker while the other downloads continue
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="github-monitor") as pool:
+                pending = {}
+                for repo_name, repo_info in selected_repos.items():
                     print(f"[GitHubMonitor] Checking {repo_name}...")
+                    pending[repo_name] = (
+                        pool.submit(self._check_commits, repo_info['url']),
+                        pool.submit(self._extract_internships, repo_info['raw_url'], limit, repo_info['parser'])
+                    )
 
-                    if check_recent_commits:
-                        # Check recent commits for activity
-                        commits_data = self._check_commits(repo_info['url'])
-
-                        # Get current content for internship extraction (WITH LIMIT)
-                        content_data = self._extract_internships(repo_info['raw_url'], limit=limit)
+                for repo_name, (commits_future, content_future) in pending.items():
+                    try:
+                        commits_data = commits_future.result()
+                        content_data = content_future.result()
 
                         results.append({
                             'repo': repo_name,
@@ -60,14 +65,18 @@ class GitHubInternshipMonitor(BaseTool):
                             'latest_commit_message': commits_data['latest_message'],
                             'internships_found': content_data['internship_count'],
                             'sample_internships': content_data['sample_internships'],  # All internships
+                            'added_internships': content_data['added'],  # Rows new since last snapshot
+                            'removed_internships': content_data['removed'],  # Rows gone since last snapshot
                             'last_checked': datetime.utcnow().isoformat()
                         })
 
-                        print(f"[GitHubMonitor] {repo_name}: {commits_data['commit_count']} recent commits, {content_data['internship_count']} internships")
+                        print(f"[GitHubMonitor] {repo_name}: {commits_data['commit_count']} recent commits, {content_data['internship_count']} internships "
+                              f"(+{len(content_data['added'])} / -{len(content_data['removed'])})")
 
-                except Exception as e:
-                    print(f"[GitHubMonitor] Error checking {repo_name}: {str(e)}")
-                    continue
+                    except Exception as e:
+                        # One failing repo doesn't affect the others
+                        print(f"[GitHubMonitor] Error checking {repo_name}: {str(e)}")
+                        continue
 
             return {
                 "success": True,
@@ -84,19 +93,65 @@ class GitHubInternshipMonitor(BaseTool):
                 "error": str(e)
             }
 
+    def iter_listings(self, repos=None, limit=500):
+        """Yield normalized listings repo by repo, as soon as each README is parsed
+
+        READMEs are fetched concurrently like in execute(); a repo's listings
+        are yielded the moment it finishes, while slower repos keep downloading.
+        Commit activity isn't checked.
+        """
+        if repos:
+            selected_repos = {k: v for k, v in self.repos.items() if k in repos}
+        else:
+            selected_repos = self.repos
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="github-monitor") as pool:
+            pending = {
+                pool.submit(self._extract_internships, repo_info['raw_url'], limit, repo_info['parser']): repo_name
+                for repo_name, repo_info in selected_repos.items()
+            }
+
+            for future in as_completed(pending):
+                repo_name = pending[future]
+                try:
+                    content_data = future.result()
+                except Exception as e:
+                    print(f"[GitHubMonitor] Error checking {repo_name}: {str(e)}")
+                    continue
+
+                print(f"[GitHubMonitor] {repo_name}: streaming {content_data['internship_count']} internships")
+                for internship in content_data['sample_internships']:
+                    yield {
+                        'company': internship['company'],
+                        'position': internship['position'],
+                        'location': internship['location'],
+                        'url': internship['url'],
+                        'source': internship['source'],
+                        'age_days': internship.get('age_days')
+                    }
+
     def _check_commits(self, commits_url):
         """Check recent commits on the repo"""
         try:
-            response = requests.get(commits_url, timeout=15)
+            response = self.http.get(commits_url, headers=self.validators.conditional_headers(commits_url), timeout=15)
+
+            # Nothing new since last time: reuse the stored summary
+            if response.status_code == 304:
+                cached = self.validators.get(commits_url)
+                if cached:
+                    return cached['parsed']
+
             if response.status_code == 200:
                 commits = response.json()
                 recent_commits = commits[:10]  # Last 10 commits
 
-                return {
+                summary = {
                     'commit_count': len(recent_commits),
                     'latest_time': recent_commits[0]['commit']['author']['date'] if recent_commits else None,
                     'latest_message': recent_commits[0]['commit']['message'] if recent_commits else None
                 }
+                self.validators.store(commits_url, response, summary)
+                return summary
             else:
                 return {'commit_count': 0, 'latest_time': None, 'latest_message': None}
 
@@ -104,92 +159,70 @@ class GitHubInternshipMonitor(BaseTool):
             print(f"[GitHubMonitor] Error checking commits: {str(e)}")
             return {'commit_count': 0, 'latest_time': None, 'latest_message': None}
 
-    def _extract_internships(self, raw_url, limit=500):
+    def _extract_internships(self, raw_url, limit=500, parser='auto'):
         """Extract internship listings from README"""
         try:
             print(f"[GitHubMonitor] Fetching README content...")
-            response = requests.get(raw_url, timeout=20)
-
-            if response.status_code != 200:
+            # The cached parse is only valid for the parser that produced it
+            validator_key = f"{raw_url}#{parser}"
+            response = self.http.get(raw_url, headers=self.validators.conditional_headers(validator_key), timeout=20)
+
+            cached = self.validators.get(validator_key) if response.status_code == 304 else None
+            if cached:
+                # README unchanged since last fetch: skip download and parsing
+                internships = cached['parsed']
+                added, removed = [], []
+                print(f"[GitHubMonitor] README not modified, reusing {len(internships)} parsed internships")
+
+            elif response.status_code != 200:
                 print(f"[GitHubMonitor] Failed to fetch README: {response.status_code}")
-                return {'internship_count': 0, 'sample_internships': []}
-
-            content = response.text
-            internships = []
-
-            print(f"[GitHubMonitor] Parsing internships (limit: {limit})...")
-
-            # Pattern 1: SimplifyJobs HTML table format with age
-            # <td><strong><a href="...">Company</a></strong></td>
-            # <td>Position</td>
-            # <td>Location</td>
-            # <td>...<a href="apply_url">...</td>
-            # <td>Xd</td> (age in days)
-            pattern1 = r'<tr>\s*<td><strong><a[^>]*>([^<]+)</a></strong></td>\s*<td>([^<]+)</td>\s*<td>([^<]+)</td>\s*<td[^>]*>.*?<a href="([^"]+)"[^>]*><img[^>]*alt="Apply"[^>]*>.*?</td>\s*<td>(\d+)d</td>'
-            matches1 = re.findall(pattern1, content, re.DOTALL)
-
-            for match in matches1[:limit]:
-                company = match[0].strip()
-                position = match[1].strip()
-                location = match[2].strip()
-                url = match[3].strip()
-                age_days = match[4].strip() if len(match) > 4 else "0"
-
-                # Skip if URL is not a real application link
-                if 'simplify.jobs' in url and '/c/' in url:
-                    continue  # Skip company profile links
-
-                internships.append({
-                    'company': company,
-                    'position': position,
-                    'location': location,
-                    'url': url,
-                    'age_days': age_days,
-                    'source': 'GitHub'
-                })
-
-                if len(internships) >= limit:
-                    break
-
-            print(f"[GitHubMonitor] Pattern 1 found {len(internships)} internships")
+                return {'internship_count': 0, 'sample_internships': [], 'added': [], 'removed': []}
 
-            # Pattern 2: SpeedyApply markdown format
-            # | Company | Position | Location | Link |
-            if len(internships) < 10:
-                pattern2 = r'\|\s*\[([^\]]+)\]\([^)]+\)\s*\|\s*([^|]+)\|\s*([^|]+)\|\s*\[Apply\]\(([^)]+)\)'
-                matches2 = re.findall(pattern2, content)
-
-                for match in matches2[:limit]:
-                    company = match[0].strip()
-                    position = match[1].strip()
-                    location = match[2].strip()
-                    url = match[3].strip()
-
-                    internships.append({
-                        'company': company,
-                        'position': position,
-                        'location': location,
-                        'url': url,
-                        'source': 'GitHub'
-                    })
+            else:
+                key = content_key(response.text, parser)
+                internships = self.parse_cache.get(key)
 
-                    if len(internships) >= limit:
-                        break
+                if internships is not None and self.snapshots.last_key(raw_url, parser) == key:
+                    # Same content another run already parsed: nothing added or removed
+                    added, removed = [], []
+                    print(f"[GitHubMonitor] README content unchanged, reusing {len(internships)} parsed internships")
+                else:
+                    internships, added, removed = self._diff_readme(raw_url, response.text, parser, key)
+                    self.parse_cache.put(key, internships)
 
-                print(f"[GitHubMonitor] Pattern 2 found {len(internships)} total")
+                self.validators.store(validator_key, response, internships)
 
+            internships = internships[:limit]
             print(f"[GitHubMonitor] ✅ Found {len(internships)} internships")
 
             return {
                 'internship_count': len(internships),
-                'sample_internships': internships
+                'sample_internships': internships,
+                'added': added,
+                'removed': removed
             }
             
         except Exception as e:
             print(f"[GitHubMonitor] Error extracting internships: {str(e)}")
             import traceback
             traceback.print_exc()
-            return {'internship_count': 0, 'sample_internships': []}
+            return {'internship_count': 0, 'sample_internships': [], 'added': [], 'removed': []}
+
+    def _diff_readme(self, raw_url, content, parser='auto', key=None):
+        """Row-level diff against the last snapshot; only new rows get parsed"""
+        readme_parser = get_parser(parser)
+        previous = self.snapshots.load(raw_url, parser)
+        rows, added, removed = diff_readme(content, previous, readme_parser)
+        self.snapshots.save(raw_url, rows, key, parser)
+
+        parsed_rows = [parsed for _, parsed in rows]
+        formats = readme_parser.counted_formats(parsed_rows)
+        internships = select_listings(parsed_rows, formats)
+        added = select_listings(added, formats)
+        removed = select_listings(removed, formats)
+
+        print(f"[GitHubMonitor] {len(rows)} rows, {len(added)} added, {len(removed)} removed since last snapshot")
+        return internships, added, removed
 
 
 class GitHubChangeDetector(BaseTool):
@@ -209,28 +242,10 @@ class GitHubChangeDetector(BaseTool):
             new_internships = []
             repo_updates = []
 
+            parsed = []
             for repo_data in results["data"]["repo_data"]:
-                # Check if we have new internships to add to database
                 for internship in repo_data.get("sample_internships", []):
-                    # Check if this combination exists in database
-                    session = get_db_session()
-                    existing = session.query(InternshipListing).filter_by(
-                        company=internship['company'],
-                        title=internship['position']
-                    ).first()
-
-                    if not existing:
-                        new_internships.append({
-                            'title': internship['position'],
-                            'company': internship['company'],
-                            'location': internship['location'],
-                            'url': internship['url'],  # Now contains real URL
-                            'source': 'GitHub-' + repo_data['repo'],
-                            'discovered_at': datetime.utcnow().isoformat()
-                        })
-                        print(f"[GitHubChangeDetector] 🚨 NEW: {internship['position']} at {internship['company']}")
-
-                    session.close()
+                    parsed.append((repo_data['repo'], internship))
 
                 repo_updates.append({
                     'repo': repo_data['repo'],
@@ -238,6 +253,32 @@ class GitHubChangeDetector(BaseTool):
                     'latest_commit': repo_data['latest_commit_message']
                 })
 
+            # Load the stored keys for every parsed listing up front, then
+            # find new postings with one set-difference pass
+            with session_scope() as session:
+                known_urls, known_pairs = fetch_existing_keys(
+                    session,
+                    [{'url': internship['url'], 'title': internship['position']} for _, internship in parsed]
+                )
+
+            for repo, internship in parsed:
+                pair = (internship['position'], internship['company'])
+                if pair in known_pairs or internship['url'] in known_urls:
+                    continue
+
+                # Same posting listed by several repos is only reported once
+                known_pairs.add(pair)
+                known_urls.add(internship['url'])
+                new_internships.append({
+                    'title': internship['position'],
+                    'company': internship['company'],
+                    'location': internship['location'],
+                    'url': internship['url'],  # Now contains real URL
+                    'source': 'GitHub-' + repo,
+                    'discovered_at': datetime.utcnow().isoformat()
+                })
+                print(f"[GitHubChangeDetector] 🚨 NEW: {internship['position']} at {internship['company']}")
+
             return {
                 "success": True,
                 "data": {
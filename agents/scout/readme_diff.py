@@ -0,0 +1,88 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shared.tools.http_cache import get_cache_dir
+from agents.scout.readme_parser import get_parser
+import hashlib
+import json
+import tempfile
+
+# A README is split into table rows; each row is hashed and parsed on its own,
+# so only rows that are new since the last snapshot need to be parsed.
+def row_hash(row):
+    return hashlib.blake2b(row.encode(), digest_size=12).hexdigest()
+
+
+def select_listings(parsed_rows, formats):
+    """Drop non-listing rows and uncounted formats, HTML rows first"""
+    listings = [listing for listing in parsed_rows if listing and listing['format'] in formats]
+    listings.sort(key=lambda listing: listing['format'] != 'html')
+    return [{k: v for k, v in listing.items() if k != 'format'} for listing in listings]
+
+
+class ReadmeSnapshotStore:
+    """Last seen (row hash, parsed row) list per README URL and parser type
+
+    Alongside each snapshot a small .key file records the content key of the
+    README it was taken from, so callers can tell an unchanged README without
+    loading the rows. Snapshots are kept per parser type, so switching a
+    source's parser never diffs against rows parsed the old way.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.path.join(get_cache_dir(), "readme_snapshots")
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, url, parser, ext=".json"):
+        return os.path.join(self.cache_dir, hashlib.sha1(f"{parser}:{url}".encode()).hexdigest() + ext)
+
+    def load(self, url, parser='auto'):
+        try:
+            with open(self._path(url, parser)) as f:
+                return [tuple(entry) for entry in json.load(f)["rows"]]
+        except (OSError, ValueError, KeyError):
+            return []
+
+    def last_key(self, url, parser='auto'):
+        """Content key of the README the current snapshot was taken from"""
+        try:
+            with open(self._path(url, parser, ".key")) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+
+    def save(self, url, rows, content_key=None, parser='auto'):
+        for ext, data in ((".json", json.dumps({"url": url, "rows": rows})), (".key", content_key or "")):
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, self._path(url, parser, ext))
+
+
+def diff_readme(content, previous_rows, parser=None):
+    """Diff README rows against the previous snapshot, parsing only new rows
+
+    Returns (rows, added, removed): the new snapshot as (hash, parsed) pairs,
+    and the parsed listings whose rows appeared or disappeared. parser is
+    the source's ReadmeParser ('auto' by default).
+    """
+    parser = parser or get_parser()
+    known = dict(previous_rows)
+    rows = []
+    added = []
+    seen = set()
+
+    for raw in parser.iter_rows(content):
+        digest = row_hash(raw)
+        if digest in known:
+            parsed = known[digest]
+        else:
+            parsed = parser.parse_row(raw)
+            if parsed and digest not in seen:
+                added.append(parsed)
+        seen.add(digest)
+        rows.append((digest, parsed))
+
+    removed = [parsed for digest, parsed in previous_rows if parsed and digest not in seen]
+    return rows, added, removed
@@ -0,0 +1,149 @@
+"""Single-pass README table tokenizer
+
+Walks a README once with str.find, yielding each HTML `<tr>` row and each
+markdown `|` row, then matches every row on its own with the patterns the
+scraper has always used. Run over the whole document, those patterns'
+`.*?` spans could backtrack across every following row when a row failed
+late (a README whose age column holds dates made parsing cubic); matched
+per row, a failure only retries within that row. Accepted rows:
+
+    HTML (SimplifyJobs):  <td><strong><a ...>Company</a></strong></td> <td>Position</td>
+                          <td>Location</td> <td ...>... <a href="url"><img alt="Apply"> ...</td>
+                          <td>12d</td>
+    Markdown (SpeedyApply): | [Company](link) | Position | Location | [Apply](url) ...
+
+Each README source picks a parser type in the repo registry
+(agents/scout/github_repos.json); get_parser() builds one shared
+ReadmeParser per type per process.
+
+Benchmark: scripts/bench_readme_parser.py
+"""
+from functools import lru_cache
+import re
+
+HTML_ROW_PATTERN = (r'<tr>\s*<td><strong><a[^>]*>([^<]+)</a></strong></td>\s*<td>([^<]+)</td>\s*<td>([^<]+)</td>'
+                    r'\s*<td[^>]*>.*?<a href="([^"]+)"[^>]*><img[^>]*alt="Apply"[^>]*>.*?</td>\s*<td>(\d+)d</td>')
+MARKDOWN_ROW_PATTERN = r'\|\s*\[([^\]]+)\]\([^)]+\)\s*\|\s*([^|]+)\|\s*([^|]+)\|\s*\[Apply\]\(([^)]+)\)'
+
+HTML_ROW = re.compile(HTML_ROW_PATTERN, re.DOTALL)
+MARKDOWN_ROW = re.compile(MARKDOWN_ROW_PATTERN)
+
+
+def iter_rows(content, html=True, markdown=True):
+    """Yield raw table rows ('<tr>...</tr>' blocks and lines starting with '|') in order"""
+    length = len(content)
+    pos = 0
+    next_tr = content.find('<tr>') if html else -1
+    next_pipe = -1
+    if markdown:
+        next_pipe = 0 if content.startswith('|') else content.find('\n|')
+        if next_pipe > 0:
+            next_pipe += 1
+
+    while next_tr != -1 or next_pipe != -1:
+        if next_tr != -1 and (next_pipe == -1 or next_tr < next_pipe):
+            end = content.find('</tr>', next_tr)
+            end = length if end == -1 else end + 5
+            yield content[next_tr:end]
+            pos = end
+        else:
+            end = content.find('\n', next_pipe)
+            end = length if end == -1 else end
+            yield content[next_pipe:end]
+            pos = end
+
+        # Only re-scan for a marker once the cursor has moved past it
+        if next_tr != -1 and next_tr < pos:
+            next_tr = content.find('<tr>', pos)
+        if next_pipe != -1 and next_pipe < pos:
+            next_pipe = content.find('\n|', pos - 1)
+            if next_pipe != -1:
+                next_pipe += 1
+
+
+def parse_html_row(row):
+    """Parse a SimplifyJobs <tr> row into a listing dict, or None"""
+    match = HTML_ROW.match(row)
+    if not match:
+        return None
+    company, position, location, url, age_days = match.groups()
+
+    url = url.strip()
+    # Skip if URL is not a real application link
+    if 'simplify.jobs' in url and '/c/' in url:
+        return None  # Skip company profile links
+
+    return {
+        'company': company.strip(),
+        'position': position.strip(),
+        'location': location.strip(),
+        'url': url,
+        'age_days': age_days,
+        'source': 'GitHub',
+        'format': 'html'
+    }
+
+
+def parse_markdown_row(row):
+    """Parse a SpeedyApply '|' row into a listing dict, or None"""
+    match = MARKDOWN_ROW.search(row)
+    if not match:
+        return None
+    company, position, location, url = match.groups()
+    return {
+        'company': company.strip(),
+        'position': position.strip(),
+        'location': location.strip(),
+        'url': url.strip(),
+        'source': 'GitHub',
+        'format': 'markdown'
+    }
+
+
+def parse_row(row):
+    """Parse one table row into a listing dict, or None if it isn't a listing"""
+    if row.startswith('<tr>'):
+        return parse_html_row(row)
+    return parse_markdown_row(row)
+
+
+class ReadmeParser:
+    """Row tokenizer and parser for one README table layout
+
+    kind is 'html_table', 'markdown_table' or 'auto'. 'auto' reads both and,
+    as the original scraper did, only counts markdown rows when a README has
+    fewer than 10 HTML listings.
+    """
+
+    KINDS = {
+        'html_table': {'html'},
+        'markdown_table': {'markdown'},
+        'auto': {'html', 'markdown'},
+    }
+
+    def __init__(self, kind):
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown README parser type: {kind}")
+        self.kind = kind
+        self.formats = self.KINDS[kind]
+
+    def iter_rows(self, content):
+        return iter_rows(content, html='html' in self.formats, markdown='markdown' in self.formats)
+
+    def parse_row(self, row):
+        if row.startswith('<tr>'):
+            return parse_html_row(row) if 'html' in self.formats else None
+        return parse_markdown_row(row) if 'markdown' in self.formats else None
+
+    def counted_formats(self, parsed_rows):
+        """Formats whose rows make up the listing set for this README"""
+        if self.kind != 'auto':
+            return self.formats
+        html_count = sum(1 for listing in parsed_rows if listing and listing['format'] == 'html')
+        return {'html'} if html_count >= 10 else {'html', 'markdown'}
+
+
+@lru_cache(maxsize=None)
+def get_parser(kind='auto'):
+    """Process-wide ReadmeParser for a parser type"""
+    return ReadmeParser(kind)
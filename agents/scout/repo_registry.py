@@ -0,0 +1,82 @@
+"""Registry of GitHub internship repos the scout monitors
+
+Sources live in a JSON file (agents/scout/github_repos.json, or the path in
+GITHUB_REPOS_CONFIG) so new community repos can be added without code
+changes:
+
+    {
+      "SimplifyJobs": {
+        "repo": "SimplifyJobs/Summer2026-Internships",
+        "branch": "dev",
+        "parser": "html_table"
+      }
+    }
+
+Fields: repo (owner/name, required), branch (default "main"), readme
+(default "README.md"), parser ("html_table", "markdown_table" or "auto",
+default "auto"), enabled (default true), and optional url / raw_url to
+override the derived commits and README URLs.
+
+The file is read once per process (again only if it changes on disk) and
+the parsed registry is shared by every monitor instance.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import json
+import threading
+
+from agents.scout.readme_parser import ReadmeParser
+
+DEFAULT_REGISTRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "github_repos.json")
+
+_lock = threading.Lock()
+_cache = {}  # path -> (mtime, repos)
+
+
+def get_registry_path():
+    return os.getenv("GITHUB_REPOS_CONFIG", DEFAULT_REGISTRY_PATH)
+
+
+def _repo_info(name, entry):
+    """Normalize one registry entry; raises ValueError if it's invalid"""
+    if not entry.get("repo") and not (entry.get("url") and entry.get("raw_url")):
+        raise ValueError(f"Repo registry entry '{name}' needs 'repo' or both 'url' and 'raw_url'")
+
+    parser = entry.get("parser", "auto")
+    if parser not in ReadmeParser.KINDS:
+        raise ValueError(f"Repo registry entry '{name}' has unknown parser '{parser}'")
+
+    repo = entry.get("repo")
+    branch = entry.get("branch", "main")
+    readme = entry.get("readme", "README.md")
+    return {
+        'url': entry.get("url") or f"https://api.github.com/repos/{repo}/commits",
+        'raw_url': entry.get("raw_url") or f"https://raw.githubusercontent.com/{repo}/{branch}/{readme}",
+        'branch': branch,
+        'parser': parser
+    }
+
+
+def load_repos(path=None):
+    """Enabled repos from the registry file: name -> {'url', 'raw_url', 'branch', 'parser'}"""
+    path = path or get_registry_path()
+    mtime = os.path.getmtime(path)
+
+    with _lock:
+        cached = _cache.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        with open(path) as f:
+            entries = json.load(f)
+
+        repos = {
+            name: _repo_info(name, entry)
+            for name, entry in entries.items()
+            if entry.get("enabled", True)
+        }
+        _cache[path] = (mtime, repos)
+        print(f"[RepoRegistry] Loaded {len(repos)} repos from {path}")
+        return repos
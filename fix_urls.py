@@ -1,5 +1,5 @@
-from database import get_db_session, InternshipListing
-import requests
+from shared.database.database import get_db_session, InternshipListing
+from shared.tools.http_client import get_http_client
 import re
 
 def update_urls():
@@ -8,7 +8,8 @@ def update_urls():
     
     # Get GitHub content
     url = "https://raw.githubusercontent.com/SimplifyJobs/Summer2026-Internships/dev/README.md"
-    response = requests.get(url)
+    # Cached briefly so re-running the fix doesn't download the README again
+    response = get_http_client().get(url, timeout=20, cache_ttl=300)
     content = response.text
     
     # Extract real URLs from content
@@ -21,6 +21,7 @@ from agents.scout.github_monitor import GitHubInternshipMonitor, GitHubChangeDet
 from agents.scout.ats_monitor import ATSMonitorTool, ATSChangeDetectorTool
 from agents.scout.instant_alert import InstantAlertTool
 from agents.orchestrator.orchestrator_agent import OrchestratorAgent
+from shared.database.database import init_database
 import uuid
 from datetime import datetime
 
@@ -29,6 +30,11 @@ app = FastAPI(title="Multi-Agent AI System", description="Nuclear internship det
 # Job storage
 jobs = {}
 
+@app.on_event("startup")
+def startup():
+    """Create the shared engine and schema once before serving requests"""
+    init_database()
+
 class JobRequest(BaseModel):
     goal: str
 
@@ -166,6 +172,15 @@ async def run_workflow():
             "error": str(e)
         }
 
+@app.post("/backup")
+def run_backup():
+    """Take a compressed online backup of the database"""
+    try:
+        from shared.database.backup import create_backup
+        return {"success": True, "result": create_backup()}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -6,16 +6,31 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from shared.database.database import get_db_session, InternshipListing, AgentJob, mark_as_applied
-from sqlalchemy import func, or_
+from shared.database.database import InternshipListing, InternshipListingArchive, AgentJob
+from shared.database.archive import listings_with_archive
+from shared.database.async_database import init_async_database, dispose_async_database, get_async_session, await_write
+from shared.database.pagination import paginate_async
+from shared.database.stats import get_stats_async
+from shared.database.search import build_match_query, matching_ids, search_internships_async
+from sqlalchemy import select, or_
 import json
 from datetime import datetime
 from typing import Optional
 
 app = FastAPI(title="Internship Database Dashboard")
 
+@app.on_event("startup")
+def startup():
+    """Create the shared engines and schema once before serving requests"""
+    init_async_database()
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Close pooled async connections"""
+    await dispose_async_database()
+
 @app.get("/", response_class=HTMLResponse)
-def dashboard():
+async def dashboard():
     """Main dashboard with CRUD interface"""
     return """
     <!DOCTYPE html>
@@ -411,6 +426,9 @@ def dashboard():
                     <h2>Internship Opportunities</h2>
                 </div>
                 <div id="internship-list">Loading...</div>
+                <div style="text-align: center; padding: 20px;">
+                    <button class="btn btn-secondary" id="load-more" onclick="loadMore()" style="display: none;">Load More</button>
+                </div>
             </div>
         </div>
         
@@ -493,19 +511,24 @@ def dashboard():
         
         <script>
             let currentInternships = [];
+            let currentParams = new URLSearchParams({limit: 100, sort: 'relevance'});
+            let nextCursor = null;  // Keyset cursor for the page after the loaded ones
             
             async function loadData() {
                 try {
                     const sortBy = document.getElementById('sort-filter')?.value || 'relevance';
+                    currentParams = new URLSearchParams({limit: 100, sort: sortBy});
                     const [statsResponse, internshipsResponse] = await Promise.all([
                         fetch('/api/stats'),
-                        fetch(`/api/internships?limit=100&sort=${sortBy}`)
+                        fetch(`/api/internships?${currentParams}`)
                     ]);
                     
                     const stats = await statsResponse.json();
-                    const internships = await internshipsResponse.json();
+                    const page = await internshipsResponse.json();
+                    const internships = page.internships;
                     
                     currentInternships = internships;
+                    nextCursor = page.next_cursor;
                     
                     // Update stats
                     document.getElementById('total-count').textContent = stats.total;
@@ -519,8 +542,25 @@ def dashboard():
                 }
             }
             
+            async function loadMore() {
+                if (!nextCursor) return;
+                const params = new URLSearchParams(currentParams);
+                params.set('cursor', nextCursor);
+                
+                try {
+                    const response = await fetch(`/api/internships?${params}`);
+                    const page = await response.json();
+                    currentInternships = currentInternships.concat(page.internships);
+                    nextCursor = page.next_cursor;
+                    displayInternships(currentInternships);
+                } catch (error) {
+                    alert('Error loading more internships');
+                }
+            }
+            
             function displayInternships(internships) {
                 const listEl = document.getElementById('internship-list');
+                document.getElementById('load-more').style.display = nextCursor ? 'inline-block' : 'none';
                 if (internships.length === 0) {
                     listEl.innerHTML = '<div style="padding: 20px; text-align: center; color: #71717a;">No internships found</div>';
                     return;
@@ -566,27 +606,25 @@ def dashboard():
                 return 'score-low';
             }
             
-            function searchInternships() {
-                const searchTerm = document.getElementById('search-input').value.toLowerCase();
+            async function searchInternships() {
+                const searchTerm = document.getElementById('search-input').value.trim();
                 const statusFilter = document.getElementById('status-filter').value;
+                const sortBy = document.getElementById('sort-filter')?.value || 'relevance';
                 
-                let filtered = currentInternships;
-                
-                if (searchTerm) {
-                    filtered = filtered.filter(internship => 
-                        internship.title.toLowerCase().includes(searchTerm) ||
-                        internship.company.toLowerCase().includes(searchTerm) ||
-                        (internship.description && internship.description.toLowerCase().includes(searchTerm))
-                    );
-                }
+                const params = new URLSearchParams({limit: 100, sort: sortBy});
+                if (searchTerm) params.set('search', searchTerm);
+                if (statusFilter) params.set('status', statusFilter);
                 
-                if (statusFilter) {
-                    filtered = filtered.filter(internship => 
-                        (internship.application_status || 'not_applied') === statusFilter
-                    );
+                try {
+                    const response = await fetch(`/api/internships?${params}`);
+                    const page = await response.json();
+                    currentParams = params;
+                    currentInternships = page.internships;
+                    nextCursor = page.next_cursor;
+                    displayInternships(currentInternships);
+                } catch (error) {
+                    document.getElementById('internship-list').innerHTML = '<div style="padding: 20px; text-align: center; color: #e53e3e;">Error loading data</div>';
                 }
-                
-                displayInternships(filtered);
             }
             
             async function markAsApplied(id) {
@@ -704,66 +742,57 @@ def dashboard():
             
             // Load data on page load and set up refresh
             loadData();
-            setInterval(loadData, 60000); // Refresh every minute
+            // Refresh every minute, unless that would throw away pages loaded with Load More
+            setInterval(() => {
+                if (currentInternships.length <= Number(currentParams.get('limit'))) loadData();
+            }, 60000);
         </script>
     </body>
     </html>
     """
 
 @app.get("/api/stats")
-def get_stats():
-    """Get database statistics"""
-    session = get_db_session()
-    
-    total = session.query(InternshipListing).count()
-    applied = session.query(InternshipListing).filter_by(application_status="applied").count()
-    interviewing = session.query(InternshipListing).filter_by(application_status="interviewing").count()
-    
-    # This week count
-    from datetime import datetime, timedelta
-    week_ago = datetime.now() - timedelta(days=7)
-    this_week = session.query(InternshipListing).filter(InternshipListing.discovered_at >= week_ago).count()
-    
-    session.close()
-    
-    return {
-        "total": total,
-        "applied": applied,
-        "interviewing": interviewing,
-        "this_week": this_week
-    }
+async def get_stats():
+    """Get database statistics from the incrementally maintained counters"""
+    async with get_async_session() as session:
+        return await get_stats_async(session)
 
 @app.get("/api/internships")
-def get_internships(search: Optional[str] = None, status: Optional[str] = None, sort: Optional[str] = "relevance", limit: int = 50):
-    """Get internships with optional filtering"""
-    session = get_db_session()
-
-    query = session.query(InternshipListing)
+async def get_internships(search: Optional[str] = None, status: Optional[str] = None, sort: Optional[str] = "relevance", limit: int = 50, cursor: Optional[str] = None, include_archived: bool = False):
+    """Get a page of internships with optional filtering; pass next_cursor back to continue"""
+    hot_filters = []
+    archive_filters = []
 
     if search:
-        query = query.filter(
-            or_(
-                InternshipListing.title.contains(search),
-                InternshipListing.company.contains(search),
-                InternshipListing.description.contains(search)
-            )
-        )
+        match_query = build_match_query(search)
+        if match_query:
+            hot_filters.append(InternshipListing.id.in_(matching_ids(match_query)))
+            # The archive has no FTS index; it's only scanned when explicitly asked for
+            archive_filters.append(or_(
+                InternshipListingArchive.title.contains(search),
+                InternshipListingArchive.company.contains(search),
+                InternshipListingArchive.description.contains(search)
+            ))
 
     if status:
-        query = query.filter(InternshipListing.application_status == status)
-
-    # Sort options
-    if sort == "relevance":
-        internships = query.order_by(InternshipListing.relevance_score.desc()).limit(limit).all()
-    elif sort == "posted":
-        # Sort by age_days ascending (newest posts = lowest age_days)
-        internships = query.order_by(InternshipListing.age_days.asc().nullslast()).limit(limit).all()
-    elif sort == "date":
-        internships = query.order_by(InternshipListing.discovered_at.desc()).limit(limit).all()
-    elif sort == "company":
-        internships = query.order_by(InternshipListing.company.asc()).limit(limit).all()
+        hot_filters.append(InternshipListing.application_status == status)
+        archive_filters.append(InternshipListingArchive.application_status == status)
+
+    if include_archived:
+        listings = listings_with_archive(hot_filters, archive_filters)
+        statement, columns, scalars = select(listings), listings.c, False
     else:
-        internships = query.order_by(InternshipListing.relevance_score.desc()).limit(limit).all()
+        statement, columns, scalars = select(InternshipListing).where(*hot_filters), InternshipListing, True
+
+    # Keyset pagination for every sort option (relevance, posted, date, company)
+    async with get_async_session() as session:
+        try:
+            internships, next_cursor = await paginate_async(
+                session, statement, sort=sort, limit=limit, cursor=cursor,
+                columns=columns, scalars=scalars
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
     result = []
     for internship in internships:
@@ -779,89 +808,84 @@ def get_internships(search: Optional[str] = None, status: Optional[str] = None,
             "applied": internship.applied,
             "notes": internship.notes,
             "relevance_score": internship.relevance_score or 0,
-            "age_days": internship.age_days
+            "age_days": internship.age_days,
+            "archived": getattr(internship, "archived", False)
         })
 
-    session.close()
-    return result
+    return {"internships": result, "next_cursor": next_cursor}
+
+@app.get("/api/search")
+async def search_listings(q: str, limit: int = 20):
+    """Full-text search ranked by bm25, with highlighted snippets"""
+    async with get_async_session() as session:
+        return await search_internships_async(session, q, limit=limit, snippet_start="<mark>", snippet_end="</mark>")
 
 @app.post("/api/internships")
-def create_internship(data: dict):
+async def create_internship(data: dict):
     """Create new internship"""
-    session = get_db_session()
-    
-    internship = InternshipListing(
-        agent_job_id="manual",
-        title=data.get("title", ""),
-        company=data.get("company", ""),
-        location=data.get("location", ""),
-        url=data.get("url", ""),
-        notes=data.get("notes", "")
-    )
+    def _create(session):
+        session.add(InternshipListing(
+            agent_job_id="manual",
+            title=data.get("title", ""),
+            company=data.get("company", ""),
+            location=data.get("location", ""),
+            url=data.get("url", ""),
+            notes=data.get("notes", "")
+        ))
     
-    session.add(internship)
-    session.commit()
-    session.close()
+    await await_write(_create)
     
     return {"success": True}
 
 @app.put("/api/internships/{internship_id}")
-def update_internship(internship_id: int, data: dict):
+async def update_internship(internship_id: int, data: dict):
     """Update internship"""
-    session = get_db_session()
-    
-    internship = session.query(InternshipListing).get(internship_id)
-    if not internship:
-        session.close()
-        raise HTTPException(status_code=404, detail="Internship not found")
-    
-    # Update fields
-    for key, value in data.items():
-        if hasattr(internship, key):
-            setattr(internship, key, value)
-    
-    # Set application date if marking as applied
-    if data.get('application_status') == 'applied' and not internship.applied:
-        internship.applied = True
-        internship.application_date = datetime.utcnow()
+    def _update(session):
+        internship = session.query(InternshipListing).get(internship_id)
+        if not internship:
+            raise HTTPException(status_code=404, detail="Internship not found")
+        
+        # Update fields
+        for key, value in data.items():
+            if hasattr(internship, key):
+                setattr(internship, key, value)
+        
+        # Set application date if marking as applied
+        if data.get('application_status') == 'applied' and not internship.applied:
+            internship.applied = True
+            internship.application_date = datetime.utcnow()
     
-    session.commit()
-    session.close()
+    await await_write(_update)
     
     return {"success": True}
 
 @app.post("/api/internships/{internship_id}/apply")
-def mark_internship_applied(internship_id: int):
+async def mark_internship_applied(internship_id: int):
     """Mark internship as applied"""
-    session = get_db_session()
-    
-    internship = session.query(InternshipListing).get(internship_id)
-    if not internship:
-        session.close()
-        raise HTTPException(status_code=404, detail="Internship not found")
-    
-    internship.applied = True
-    internship.application_status = "applied"
-    internship.application_date = datetime.utcnow()
+    def _apply(session):
+        internship = session.query(InternshipListing).get(internship_id)
+        if not internship:
+            raise HTTPException(status_code=404, detail="Internship not found")
+        
+        internship.applied = True
+        internship.application_status = "applied"
+        internship.application_date = datetime.utcnow()
     
-    session.commit()
-    session.close()
+    await await_write(_apply)
     
     return {"success": True}
 
 @app.delete("/api/internships/{internship_id}")
-def delete_internship(internship_id: int):
+async def delete_internship(internship_id: int):
     """Delete internship"""
-    session = get_db_session()
-    
-    internship = session.query(InternshipListing).get(internship_id)
-    if not internship:
-        session.close()
-        raise HTTPException(status_code=404, detail="Internship not found")
+    def _delete(session):
+        internship = session.query(InternshipListing).get(internship_id)
+        if not internship:
+            raise HTTPException(status_code=404, detail="Internship not found")
+        
+        session.delete(internship)
     
-    session.delete(internship)
-    session.commit()
-    session.close()
+    await await_write(_delete)
     
     return {"success": True}
 
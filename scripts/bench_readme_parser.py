@@ -0,0 +1,131 @@
+"""Benchmark README parsing: whole-document regexes vs the same regexes per row
+
+Builds a synthetic README with SimplifyJobs-style HTML rows (including the
+'↳' continuation rows and multi-location <details> cells the listing
+pattern rejects) plus a SpeedyApply-style markdown table, then times:
+
+  before: the two findall() patterns _extract_internships used to run
+  after:  agents/scout/readme_parser.iter_rows + parse_row (same patterns,
+          matched one row at a time)
+  diff:   readme_diff.diff_readme against a snapshot of the same README,
+          which is what an unchanged poll costs (rows are hashed, not parsed)
+
+and checks both produce the same listings. On a well-formed README the
+per-row pass costs about twice the findall, since every row is sliced out
+(the diff needs the raw rows to hash anyway). A second run uses a table
+whose age column isn't in the `12d` form (older READMEs used dates): every
+row then fails late in pattern 1 and its `.*?` spans retry across the rest
+of the document, so the findall is timed on a few hundred rows only.
+
+    python scripts/bench_readme_parser.py --rows 20000 --repeat 3
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agents.scout.readme_parser import iter_rows, parse_row, HTML_ROW_PATTERN, MARKDOWN_ROW_PATTERN
+from agents.scout.readme_diff import diff_readme
+import argparse
+import random
+import time
+import re
+
+# readme_parser matches these per row; before, they ran over the whole README
+PATTERN1 = HTML_ROW_PATTERN
+PATTERN2 = MARKDOWN_ROW_PATTERN
+
+
+def html_row(i, rng, dated=False):
+    kind = rng.random()
+    if kind < 0.2:
+        company = '<td>↳</td>'
+    else:
+        company = f'<td><strong><a href="https://simplify.jobs/c/co{i}">Company {i}</a></strong></td>'
+    if kind > 0.9:
+        location = f'<td><details><summary><strong>3 locations</strong></summary>City {i}, CA</br>Remote</details></td>'
+    else:
+        location = f'<td>City {i}, CA</td>'
+    return (f'<tr>\n{company}\n<td>Software Engineer Intern {i}</td>\n{location}\n'
+            f'<td><div align="center"><a href="https://jobs.example.com/{i}?utm_source=Simplify">'
+            f'<img src="https://i.imgur.com/apply.png" width="118" alt="Apply"></a> '
+            f'<a href="https://simplify.jobs/p/{i}"><img src="https://i.imgur.com/simplify.png" width="26" alt="Simplify"></a>'
+            f'</div></td>\n<td>{f"Oct {i % 28 + 1:02d}" if dated else f"{i % 90}d"}</td>\n</tr>\n')
+
+
+def markdown_row(i):
+    return f'| [Company {i}](https://c{i}.com) | SWE Intern {i} | Remote | [Apply](https://apply.example.com/{i}) |\n'
+
+
+def synthetic_readme(rows, dated=False, seed=0):
+    """README with `rows` HTML rows followed by rows // 10 markdown rows"""
+    rng = random.Random(seed)
+    html = ''.join(html_row(i, rng, dated) for i in range(rows))
+    markdown = ''.join(markdown_row(i) for i in range(rows // 10))
+    return ('# Summer 2026 Internships\n\n<table>\n<thead><tr><th>Company</th></tr></thead>\n<tbody>\n'
+            + html + '</tbody>\n</table>\n\n## Other\n\n| Company | Role | Location | Link |\n|---|---|---|---|\n'
+            + markdown)
+
+
+def parse_before(content):
+    html = []
+    for company, position, location, url, age_days in re.findall(PATTERN1, content, re.DOTALL):
+        url = url.strip()
+        if 'simplify.jobs' in url and '/c/' in url:
+            continue
+        html.append((company.strip(), position.strip(), location.strip(), url, age_days.strip()))
+    markdown = [tuple(group.strip() for group in match) + (None,) for match in re.findall(PATTERN2, content)]
+    return html, markdown
+
+
+def parse_after(content):
+    html, markdown = [], []
+    for row in iter_rows(content):
+        listing = parse_row(row)
+        if not listing:
+            continue
+        entry = (listing['company'], listing['position'], listing['location'], listing['url'], listing.get('age_days'))
+        (html if listing['format'] == 'html' else markdown).append(entry)
+    return html, markdown
+
+
+def best_of(fn, content, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(content)
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark README table parsing")
+    parser.add_argument("--rows", type=int, default=20000, help="Number of HTML table rows")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per parser (best is reported)")
+    parser.add_argument("--dated-rows", type=int, nargs="+", default=[100, 200, 300],
+                        help="Table sizes for the regexes on the dated-age README")
+    args = parser.parse_args()
+
+    content = synthetic_readme(args.rows)
+    print(f"[Bench] README: {args.rows} HTML rows + {args.rows // 10} markdown rows, {len(content) / 1e6:.1f} MB")
+
+    before, expected = best_of(parse_before, content, args.repeat)
+    after, actual = best_of(parse_after, content, args.repeat)
+
+    print(f"[Bench] regex findall:  {before * 1000:8.1f} ms  ({len(expected[0])} html, {len(expected[1])} markdown)")
+    print(f"[Bench] per-row regex:  {after * 1000:8.1f} ms  ({len(actual[0])} html, {len(actual[1])} markdown)")
+
+    snapshot, _, _ = diff_readme(content, [])
+    unchanged, (_, added, _) = best_of(lambda text: diff_readme(text, snapshot), content, args.repeat)
+    print(f"[Bench] unchanged diff: {unchanged * 1000:8.1f} ms  ({len(added)} rows parsed)")
+
+    if actual != expected:
+        print("[Bench] MISMATCH: per-row output differs from the whole-document regexes")
+        sys.exit(1)
+    print("[Bench] Outputs match")
+
+    print("[Bench] Dated age column (no row matches pattern 1):")
+    for rows in args.dated_rows:
+        before, expected = best_of(parse_before, synthetic_readme(rows, dated=True), 1)
+        print(f"[Bench] regex findall:  {before * 1000:8.1f} ms  ({rows} rows)")
+    after, actual = best_of(parse_after, synthetic_readme(args.rows, dated=True), args.repeat)
+    print(f"[Bench] per-row regex:  {after * 1000:8.1f} ms  ({args.rows} rows)")
@@ -0,0 +1,119 @@
+"""Hot/cold archival of stale listings
+
+Old seasons, long-open postings and rejected applications are moved from
+`internship_listings` into `internship_listings_archive` (same columns),
+so the dashboard's default queries only scan the active set. Listings
+that are applied, interviewing or have an offer are never archived.
+Archived listings still count towards the listing_stats totals.
+
+Run it from cron:
+
+    python shared/database/archive.py --max-age-days 120 --max-discovered-days 240
+
+Queries that want cold rows too can select from `listings_with_archive()`.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import select, insert, delete, func, and_, or_, literal, union_all
+from datetime import datetime, timedelta
+import argparse
+
+from shared.database.database import InternshipListing, InternshipListingArchive
+
+LISTING_COLUMNS = [column.name for column in InternshipListing.__table__.columns]
+
+
+def _stale_condition(max_age_days, max_discovered_days, include_rejected):
+    """Rows that are old enough to leave the active table"""
+    cutoff = datetime.utcnow() - timedelta(days=max_discovered_days)
+    status = InternshipListing.application_status
+
+    untouched = or_(status.is_(None), status == "not_applied")
+    stale = or_(InternshipListing.age_days >= max_age_days, InternshipListing.discovered_at < cutoff)
+    condition = and_(untouched, stale)
+
+    if include_rejected:
+        condition = or_(condition, status == "rejected")
+    return condition
+
+
+def archive_stale_listings(max_age_days=None, max_discovered_days=None,
+                           include_rejected=True, batch_size=500):
+    """Move stale listings into the archive in batches; returns rows moved"""
+    from shared.database.writer import run_write
+
+    if max_age_days is None:
+        max_age_days = int(os.getenv("ARCHIVE_MAX_AGE_DAYS", "120"))
+    if max_discovered_days is None:
+        max_discovered_days = int(os.getenv("ARCHIVE_MAX_DISCOVERED_DAYS", "240"))
+    condition = _stale_condition(max_age_days, max_discovered_days, include_rejected)
+
+    # An id already in the archive means SQLite reused a deleted rowid; that row
+    # is left where it is rather than overwriting the unrelated archived listing
+    reused_id = InternshipListing.id.in_(select(InternshipListingArchive.id))
+
+    hot_columns = [getattr(InternshipListing, name) for name in LISTING_COLUMNS]
+
+    def _archive_batch(session):
+        # Never move the newest row, so SQLite can't reuse an archived id
+        max_id = session.query(func.max(InternshipListing.id)).scalar()
+        if max_id is None:
+            return 0
+
+        ids = [row[0] for row in session.query(InternshipListing.id).filter(
+            condition, InternshipListing.id < max_id, ~reused_id
+        ).limit(batch_size)]
+        if not ids:
+            return 0
+
+        session.execute(
+            insert(InternshipListingArchive).from_select(
+                LISTING_COLUMNS,
+                select(*hot_columns).where(InternshipListing.id.in_(ids))
+            )
+        )
+        session.execute(delete(InternshipListing).where(InternshipListing.id.in_(ids)))
+        return len(ids)
+
+    # One short write transaction per batch so other writers aren't held up
+    moved = 0
+    while True:
+        count = run_write(_archive_batch)
+        moved += count
+        if count < batch_size:
+            break
+
+    print(f"[Archive] Moved {moved} stale listings to the archive")
+
+    def _count_reused(session):
+        return session.query(func.count(InternshipListing.id)).filter(condition, reused_id).scalar()
+
+    skipped = run_write(_count_reused)
+    if skipped:
+        print(f"[Archive] ⚠️ Skipped {skipped} stale listings whose id is already taken in the archive")
+    return moved
+
+
+def listings_with_archive(hot_filters=(), archive_filters=()):
+    """Subquery over active and archived listings with an `archived` flag column"""
+    hot = select(
+        *[getattr(InternshipListing, name) for name in LISTING_COLUMNS],
+        literal(False).label("archived")
+    ).where(*hot_filters)
+    cold = select(
+        *[getattr(InternshipListingArchive, name) for name in LISTING_COLUMNS],
+        literal(True).label("archived")
+    ).where(*archive_filters)
+    return union_all(hot, cold).subquery("listings")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive stale internship listings")
+    parser.add_argument("--max-age-days", type=int, help="Archive postings open at least this long")
+    parser.add_argument("--max-discovered-days", type=int, help="Archive listings discovered before this many days ago")
+    parser.add_argument("--keep-rejected", action="store_true", help="Leave rejected applications in the active table")
+    args = parser.parse_args()
+
+    archive_stale_listings(args.max_age_days, args.max_discovered_days, not args.keep_rejected)
@@ -0,0 +1,69 @@
+"""Async database access for the FastAPI dashboard
+
+Reads go through an aiosqlite-backed SQLAlchemy AsyncEngine so route
+handlers can await them on the event loop instead of occupying one of
+uvicorn's threadpool workers. Writes still go through the serialized
+writer (shared/database/writer.py); `await_write` waits on its Future
+without blocking a thread.
+
+Schema creation and migrations are left to the sync `init_database()`.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+import asyncio
+import threading
+
+from shared.database.database import get_database_path, init_database, apply_sqlite_pragmas, get_pool_settings
+from shared.database.writer import submit_write
+
+_async_engine = None
+_AsyncSessionLocal = None
+_async_lock = threading.Lock()
+
+
+def init_async_database():
+    """Create the process-wide async engine and session factory once"""
+    global _async_engine, _AsyncSessionLocal
+
+    if _async_engine is not None:
+        return _async_engine, _AsyncSessionLocal
+
+    with _async_lock:
+        if _async_engine is None:
+            # Make sure the schema and migrations are in place first
+            init_database()
+
+            engine = create_async_engine(
+                f"sqlite+aiosqlite:///{get_database_path()}",
+                **get_pool_settings()
+            )
+            event.listen(engine.sync_engine, "connect", apply_sqlite_pragmas)
+            _AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+            _async_engine = engine
+
+    return _async_engine, _AsyncSessionLocal
+
+
+def get_async_session():
+    """Get an AsyncSession; use as `async with get_async_session() as session:`"""
+    _, AsyncSessionLocal = init_async_database()
+    return AsyncSessionLocal()
+
+
+async def await_write(fn):
+    """Run fn(session) on the serialized writer and await its result"""
+    return await asyncio.wrap_future(submit_write(fn))
+
+
+async def dispose_async_database():
+    """Close pooled async connections (call on application shutdown)"""
+    global _async_engine, _AsyncSessionLocal
+
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
+        _AsyncSessionLocal = None
@@ -0,0 +1,99 @@
+"""Per-company ATS job-id delta tracking
+
+`ats_seen_jobs` remembers every (ats_source, company, ats_id) a poll has
+returned, with when it was first and last seen. `record_ats_poll()` diffs
+a poll against it in memory with one bulk read and one bulk upsert:
+
+    new      ids not in the table yet
+    removed  ids returned by the company's previous poll but not this one
+
+A job that disappears and later comes back keeps its first_seen and isn't
+reported as new again. Each company also has a marker row with an empty
+ats_id whose last_seen is the time of its latest poll, so "previous poll"
+is known even when a board had no jobs. The first poll of a company (no
+marker yet) only seeds its jobs: they are recorded but not reported as
+new, so adding a board doesn't alert on every posting it already has.
+
+Jobs without an ats_id are tracked by their URL instead.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert
+from datetime import datetime
+
+from shared.database.database import ATSSeenJob
+
+POLL_MARKER = ""  # ats_id of each company's last-poll marker row
+
+
+def job_key(job):
+    """ats_id a job is tracked under: its ATS id, or its URL when it has none"""
+    return job.get('ats_id') or job.get('url') or None
+
+
+def record_ats_poll(jobs, companies, ats_source="greenhouse"):
+    """Record one poll of `companies`; returns (new_jobs, removed) where removed is a list of
+    {'company', 'ats_id', 'first_seen', 'last_seen'} dicts
+
+    jobs are the poll's job dicts (with 'company' and 'ats_id' or 'url').
+    companies must list every company that was fetched successfully,
+    including ones with no jobs, and no others: a company that failed to
+    fetch would otherwise look like all of its jobs were removed. Jobs of a
+    company polled for the first time are recorded but not returned as new.
+    """
+    from shared.database.writer import run_write
+
+    companies = sorted(set(companies))
+    if not companies:
+        return [], []
+
+    def _record(session):
+        # One bulk read of what we know about these companies
+        rows = session.execute(
+            select(ATSSeenJob.company, ATSSeenJob.ats_id, ATSSeenJob.first_seen, ATSSeenJob.last_seen).where(
+                ATSSeenJob.ats_source == ats_source,
+                ATSSeenJob.company.in_(companies)
+            )
+        ).all()
+
+        previous_poll = {row.company: row.last_seen for row in rows if row.ats_id == POLL_MARKER}
+        rows = [row for row in rows if row.ats_id != POLL_MARKER]
+        seen = {(row.company, row.ats_id) for row in rows}
+
+        current = {}
+        for job in jobs:
+            key = job_key(job)
+            if key:
+                current.setdefault((job['company'], key), job)
+
+        new_jobs = [job for key, job in current.items() if key not in seen and key[0] in previous_poll]
+        seeded = sorted(company for company in companies if company not in previous_poll)
+        if seeded:
+            seeded_jobs = sum(1 for company, _ in current if company not in previous_poll)
+            print(f"[ATSJobs] First poll of {', '.join(seeded)}: recorded {seeded_jobs} existing jobs without alerting")
+        removed = [
+            {'company': row.company, 'ats_id': row.ats_id, 'first_seen': row.first_seen, 'last_seen': row.last_seen}
+            for row in rows
+            if (row.company, row.ats_id) not in current and row.last_seen == previous_poll.get(row.company)
+        ]
+
+        # One bulk upsert: new ids get first_seen, current ids and poll markers get last_seen
+        now = datetime.utcnow()
+        keys = list(current) + [(company, POLL_MARKER) for company in companies]
+        statement = insert(ATSSeenJob)
+        session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[ATSSeenJob.ats_source, ATSSeenJob.company, ATSSeenJob.ats_id],
+                set_={"last_seen": statement.excluded.last_seen}
+            ),
+            [
+                {"ats_source": ats_source, "company": company, "ats_id": ats_id, "first_seen": now, "last_seen": now}
+                for company, ats_id in keys
+            ]
+        )
+        return new_jobs, removed
+
+    return run_write(_record)
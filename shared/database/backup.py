@@ -0,0 +1,184 @@
+"""Online, compressed database backups
+
+Snapshots are taken with SQLite's online backup API a few pages at a
+time, so a running workflow can keep writing while the copy is made.
+Each snapshot is integrity-checked, compressed (zstd when the
+`zstandard` package is installed, gzip otherwise) and old snapshots are
+pruned to N daily plus M weekly.
+
+Usable from the Telegram bot, the API (`POST /backup`) and cron:
+
+    python shared/database/backup.py --keep-daily 7 --keep-weekly 4
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from datetime import datetime
+import argparse
+import gzip
+import re
+import shutil
+import sqlite3
+import tempfile
+
+from shared.database.database import get_database_path
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+SNAPSHOT_RE = re.compile(r"^internships_(\d{8}_\d{6})\.db\.(gz|zst)$")
+
+
+def get_backup_dir():
+    """Backups live next to the database unless BACKUP_DIR is set"""
+    default = os.path.join(os.path.dirname(get_database_path()), "backups")
+    return os.getenv("BACKUP_DIR", default)
+
+
+def _copy_online(src_path, dest_path, pages_per_step, sleep):
+    """Copy a live database in page-sized steps without blocking writers"""
+    if not os.path.exists(src_path):
+        raise FileNotFoundError(f"Database not found: {src_path}")
+    src = sqlite3.connect(src_path, timeout=30)
+    dest = sqlite3.connect(dest_path)
+    try:
+        with dest:
+            src.backup(dest, pages=pages_per_step, sleep=sleep)
+        # Snapshot is a standalone file, not a WAL database
+        dest.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        dest.close()
+        src.close()
+
+
+def _integrity_check(path):
+    """Return SQLite's integrity_check result ('ok' when healthy)"""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute("PRAGMA integrity_check").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _compress(src_path, dest_path, compression):
+    with open(src_path, "rb") as src:
+        if compression == "zst":
+            with open(dest_path, "wb") as dest:
+                zstandard.ZstdCompressor(level=10).copy_stream(src, dest)
+        else:
+            with gzip.open(dest_path, "wb", compresslevel=6) as dest:
+                shutil.copyfileobj(src, dest)
+
+
+def _decompress(src_path, dest_path):
+    if src_path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .zst backups")
+        with open(src_path, "rb") as src, open(dest_path, "wb") as dest:
+            zstandard.ZstdDecompressor().copy_stream(src, dest)
+    else:
+        with gzip.open(src_path, "rb") as src, open(dest_path, "wb") as dest:
+            shutil.copyfileobj(src, dest)
+
+
+def verify_backup(path):
+    """Decompress a snapshot to a temp file and integrity-check it"""
+    with tempfile.TemporaryDirectory() as tmp:
+        restored = os.path.join(tmp, "verify.db")
+        _decompress(path, restored)
+        return _integrity_check(restored) == "ok"
+
+
+def prune_backups(backup_dir=None, keep_daily=7, keep_weekly=4):
+    """Keep the newest snapshot of each of the last N days and M ISO weeks"""
+    backup_dir = backup_dir or get_backup_dir()
+    snapshots = []
+    for name in os.listdir(backup_dir):
+        match = SNAPSHOT_RE.match(name)
+        if match:
+            snapshots.append((datetime.strptime(match.group(1), "%Y%m%d_%H%M%S"), name))
+    snapshots.sort(reverse=True)
+
+    keep = set()
+    days, weeks = [], []
+    for taken_at, name in snapshots:
+        day = taken_at.date()
+        week = taken_at.isocalendar()[:2]
+        if day not in days and len(days) < keep_daily:
+            days.append(day)
+            keep.add(name)
+        if week not in weeks and len(weeks) < keep_weekly:
+            weeks.append(week)
+            keep.add(name)
+
+    removed = []
+    for _, name in snapshots:
+        if name not in keep:
+            os.remove(os.path.join(backup_dir, name))
+            removed.append(name)
+    return removed
+
+
+def create_backup(backup_dir=None, keep_daily=None, keep_weekly=None,
+                  compression=None, pages_per_step=256, sleep=0.005):
+    """Take a verified, compressed online snapshot and apply retention"""
+    backup_dir = backup_dir or get_backup_dir()
+    keep_daily = keep_daily if keep_daily is not None else int(os.getenv("BACKUP_KEEP_DAILY", "7"))
+    keep_weekly = keep_weekly if keep_weekly is not None else int(os.getenv("BACKUP_KEEP_WEEKLY", "4"))
+    compression = compression or os.getenv("BACKUP_COMPRESSION", "zst")
+    if compression == "zst" and zstandard is None:
+        compression = "gz"
+
+    os.makedirs(backup_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = f"internships_{timestamp}.db.{compression}"
+    backup_path = os.path.join(backup_dir, filename)
+
+    with tempfile.TemporaryDirectory(dir=backup_dir) as tmp:
+        snapshot = os.path.join(tmp, "snapshot.db")
+        _copy_online(get_database_path(), snapshot, pages_per_step, sleep)
+
+        status = _integrity_check(snapshot)
+        if status != "ok":
+            raise RuntimeError(f"Snapshot failed integrity check: {status}")
+
+        raw_size = os.path.getsize(snapshot)
+        _compress(snapshot, backup_path + ".part", compression)
+        os.replace(backup_path + ".part", backup_path)
+
+    removed = prune_backups(backup_dir, keep_daily, keep_weekly)
+    print(f"[Backup] Saved {filename}, pruned {len(removed)} old snapshot(s)")
+
+    return {
+        "path": backup_path,
+        "filename": filename,
+        "size_bytes": os.path.getsize(backup_path),
+        "raw_size_bytes": raw_size,
+        "integrity": status,
+        "pruned": removed
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Back up internships.db")
+    parser.add_argument("--dir", help="Backup directory (default: ./backups or BACKUP_DIR)")
+    parser.add_argument("--keep-daily", type=int, help="Daily snapshots to keep")
+    parser.add_argument("--keep-weekly", type=int, help="Weekly snapshots to keep")
+    parser.add_argument("--compression", choices=["zst", "gz"], help="Compression format")
+    parser.add_argument("--verify", metavar="FILE", help="Only verify an existing snapshot")
+    args = parser.parse_args()
+
+    if args.verify:
+        ok = verify_backup(args.verify)
+        print(f"[Backup] {args.verify}: {'ok' if ok else 'FAILED integrity check'}")
+        sys.exit(0 if ok else 1)
+
+    result = create_backup(args.dir, args.keep_daily, args.keep_weekly, args.compression)
+    print(f"[Backup] {result['path']} ({result['size_bytes'] / (1024 * 1024):.2f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,15 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime, Text, Boolean, Float
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import create_engine, event, Column, Integer, String, DateTime, Text, Boolean, Float
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from contextlib import contextmanager
 from datetime import datetime
-import os
+import threading
+
+from shared.database.migrations import run_migrations
 
 Base = declarative_base()
 
@@ -17,8 +24,8 @@ class AgentJob(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime)
 
-class InternshipListing(Base):
-    __tablename__ = "internship_listings"
+class ListingColumns:
+    """Columns shared by the active listings table and its archive"""
     
     id = Column(Integer, primary_key=True)
     agent_job_id = Column(String)  # Links back to the job that found it
@@ -41,30 +48,109 @@ class InternshipListing(Base):
     
     # Quality scoring
     relevance_score = Column(Float, default=0.0)
+    scored_with = Column(String, nullable=True)  # Resume + scoring version fingerprint of relevance_score
     interest_level = Column(Integer, default=0)  # 1-5 scale
 
     # Posting age (days since posted on GitHub)
     age_days = Column(Integer, nullable=True)
 
-def get_database_url():
+class InternshipListing(ListingColumns, Base):
+    __tablename__ = "internship_listings"
+
+class InternshipListingArchive(ListingColumns, Base):
+    """Cold listings moved out of the active table by shared/database/archive.py"""
+    __tablename__ = "internship_listings_archive"
+
+class ATSSeenJob(Base):
+    """Every ATS job id seen per company, maintained by shared/database/ats_jobs.py"""
+    __tablename__ = "ats_seen_jobs"
+
+    ats_source = Column(String, primary_key=True)  # greenhouse, lever
+    company = Column(String, primary_key=True)
+    ats_id = Column(String, primary_key=True)
+    first_seen = Column(DateTime, default=datetime.utcnow)
+    last_seen = Column(DateTime, default=datetime.utcnow)
+
+def get_database_path():
     """Get database file path - uses project directory for consistency"""
     # Use project directory instead of home to avoid path issues across users
     project_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    db_path = os.path.join(project_dir, "internships.db")
-    return f"sqlite:///{db_path}"
+    return os.path.join(project_dir, "internships.db")
+
+def get_database_url():
+    """Get SQLAlchemy URL for the database file"""
+    return f"sqlite:///{get_database_path()}"
+
+# Process-wide engine and session factory, created lazily on first use
+_engine = None
+_SessionLocal = None
+_engine_lock = threading.Lock()
+
+def get_pool_settings():
+    """Read connection pool settings from the environment"""
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "3600")),
+    }
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None):
+    """Tune every new SQLite connection for concurrent readers and one writer"""
+    cursor = dbapi_connection.cursor()
+    # WAL lets readers keep going while a write transaction is open
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))}")
+    cursor.execute(f"PRAGMA cache_size=-{int(os.getenv('DB_CACHE_SIZE_KB', '20000'))}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
 
 def init_database():
-    """Initialize database and return engine and session factory"""
-    engine = create_engine(get_database_url())
-    Base.metadata.create_all(engine)
-    SessionLocal = sessionmaker(bind=engine)
-    return engine, SessionLocal
+    """Initialize database and migrations once per process, return engine and session factory"""
+    global _engine, _SessionLocal
+
+    if _engine is not None:
+        return _engine, _SessionLocal
+
+    with _engine_lock:
+        if _engine is None:
+            engine = create_engine(
+                get_database_url(),
+                connect_args={"check_same_thread": False},
+                **get_pool_settings()
+            )
+            event.listen(engine, "connect", apply_sqlite_pragmas)
+            Base.metadata.create_all(engine)
+            run_migrations(engine)
+            _SessionLocal = sessionmaker(bind=engine)
+            _engine = engine
+
+    return _engine, _SessionLocal
+
+def get_engine():
+    """Get the shared database engine"""
+    engine, _ = init_database()
+    return engine
 
 def get_db_session():
-    """Get a database session"""
+    """Get a database session from the shared session factory"""
     _, SessionLocal = init_database()
     return SessionLocal()
 
+@contextmanager
+def session_scope():
+    """Provide a transactional session: commits on success, rolls back on error"""
+    session = get_db_session()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
 # Utility functions
 def save_internship(session, listing_data, agent_job_id):
     """Save an internship listing to database"""
@@ -93,22 +179,24 @@ def save_internship(session, listing_data, agent_job_id):
 
 def get_recent_internships(limit=20):
     """Get recently discovered internships"""
-    session = get_db_session()
-    internships = session.query(InternshipListing)\
-                        .order_by(InternshipListing.discovered_at.desc())\
-                        .limit(limit).all()
-    session.close()
+    with session_scope() as session:
+        internships = session.query(InternshipListing)\
+                            .order_by(InternshipListing.discovered_at.desc())\
+                            .limit(limit).all()
+        session.expunge_all()
     return internships
 
 def mark_as_applied(internship_id, notes=""):
     """Mark an internship as applied to"""
-    session = get_db_session()
-    internship = session.query(InternshipListing).get(internship_id)
-    if internship:
-        internship.applied = True
-        internship.application_date = datetime.utcnow()
-        internship.application_status = "applied"
-        internship.notes = notes
-        session.commit()
-        print(f"[Database] Marked as applied: {internship.title}")
-    session.close()
+    from shared.database.writer import run_write
+
+    def _apply(session):
+        internship = session.query(InternshipListing).get(internship_id)
+        if internship:
+            internship.applied = True
+            internship.application_date = datetime.utcnow()
+            internship.application_status = "applied"
+            internship.notes = notes
+            print(f"[Database] Marked as applied: {internship.title}")
+
+    run_write(_apply)
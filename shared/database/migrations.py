@@ -0,0 +1,115 @@
+"""Lightweight, versioned schema migrations for internships.db
+
+`Base.metadata.create_all` only creates missing tables; it never alters an
+existing one. Each migration below runs once, in order, and the applied
+version is tracked in SQLite's `PRAGMA user_version`.
+
+A migration step is either a SQL string or a callable taking a connection.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shared.database.stats import STATS_SCHEMA_SQL, ARCHIVE_STATS_SQL, REBUILD_STATS_SQL
+
+
+def add_column(conn, table, column, ddl):
+    """Add a column to an existing table if it isn't there yet"""
+    existing = [row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")]
+    if column not in existing:
+        conn.exec_driver_sql(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+
+
+MIGRATIONS = [
+    (1, "Indexes for dashboard sorts, status filter and duplicate check", [
+        # Databases created before age_days existed never got the column
+        lambda conn: add_column(conn, "internship_listings", "age_days", "INTEGER"),
+        "CREATE INDEX IF NOT EXISTS ix_internship_listings_relevance_score ON internship_listings (relevance_score)",
+        "CREATE INDEX IF NOT EXISTS ix_internship_listings_discovered_at ON internship_listings (discovered_at)",
+        "CREATE INDEX IF NOT EXISTS ix_internship_listings_age_days ON internship_listings (age_days)",
+        "CREATE INDEX IF NOT EXISTS ix_internship_listings_company ON internship_listings (company)",
+        "CREATE INDEX IF NOT EXISTS ix_internship_listings_application_status ON internship_listings (application_status)",
+        "CREATE INDEX IF NOT EXISTS ix_internship_listings_title_company ON internship_listings (title, company)",
+        "ANALYZE internship_listings",
+    ]),
+    (2, "FTS5 full-text index over title, company and description", [
+        """CREATE VIRTUAL TABLE IF NOT EXISTS internship_listings_fts USING fts5(
+            title, company, description,
+            content='internship_listings', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2'
+        )""",
+        # External-content table: triggers keep the index in step with the rows
+        """CREATE TRIGGER IF NOT EXISTS internship_listings_fts_ai AFTER INSERT ON internship_listings BEGIN
+            INSERT INTO internship_listings_fts(rowid, title, company, description)
+            VALUES (new.id, new.title, new.company, new.description);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS internship_listings_fts_ad AFTER DELETE ON internship_listings BEGIN
+            INSERT INTO internship_listings_fts(internship_listings_fts, rowid, title, company, description)
+            VALUES ('delete', old.id, old.title, old.company, old.description);
+        END""",
+        """CREATE TRIGGER IF NOT EXISTS internship_listings_fts_au
+        AFTER UPDATE OF title, company, description ON internship_listings BEGIN
+            INSERT INTO internship_listings_fts(internship_listings_fts, rowid, title, company, description)
+            VALUES ('delete', old.id, old.title, old.company, old.description);
+            INSERT INTO internship_listings_fts(rowid, title, company, description)
+            VALUES (new.id, new.title, new.company, new.description);
+        END""",
+        "INSERT INTO internship_listings_fts(internship_listings_fts) VALUES ('rebuild')",
+    ]),
+    (3, "Trigger-maintained listing_stats counters", STATS_SCHEMA_SQL + REBUILD_STATS_SQL),
+    (4, "scored_with fingerprint for incremental rescoring", [
+        lambda conn: add_column(conn, "internship_listings", "scored_with", "VARCHAR"),
+        lambda conn: add_column(conn, "internship_listings_archive", "scored_with", "VARCHAR"),
+        "CREATE INDEX IF NOT EXISTS ix_internship_listings_scored_with ON internship_listings (scored_with)",
+        # Scores from before fingerprints are stale rather than new, so they're redone in the background
+        "UPDATE internship_listings SET scored_with = 'legacy' WHERE relevance_score > 0",
+        "UPDATE internship_listings_archive SET scored_with = 'legacy' WHERE relevance_score > 0",
+    ]),
+    (5, "Count archived listings in listing_stats", ARCHIVE_STATS_SQL + REBUILD_STATS_SQL),
+    (6, "Duplicate-check and filter indexes on the archive", [
+        # fetch_existing_keys looks archived rows up by url (already unique) or title on every save
+        "CREATE INDEX IF NOT EXISTS ix_internship_listings_archive_title_company ON internship_listings_archive (title, company)",
+        "CREATE INDEX IF NOT EXISTS ix_internship_listings_archive_company ON internship_listings_archive (company)",
+        "CREATE INDEX IF NOT EXISTS ix_internship_listings_archive_application_status ON internship_listings_archive (application_status)",
+        "ANALYZE internship_listings_archive",
+    ]),
+]
+
+
+def get_schema_version(conn):
+    """Return the last applied migration version"""
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def run_migrations(engine):
+    """Apply every migration newer than the database's current version"""
+    with engine.begin() as conn:
+        current = get_schema_version(conn)
+
+    applied = []
+    for version, description, steps in MIGRATIONS:
+        if version <= current:
+            continue
+
+        # Each migration commits atomically together with its version bump
+        with engine.begin() as conn:
+            for step in steps:
+                if callable(step):
+                    step(conn)
+                else:
+                    conn.exec_driver_sql(step)
+            conn.exec_driver_sql(f"PRAGMA user_version = {int(version)}")
+
+        print(f"[Migrations] Applied {version}: {description}")
+        applied.append(version)
+
+    return applied
+
+
+if __name__ == "__main__":
+    from shared.database.database import get_engine
+
+    engine = get_engine()
+    with engine.begin() as conn:
+        version = get_schema_version(conn)
+    print(f"[Migrations] Schema version: {version} (latest: {MIGRATIONS[-1][0]})")
@@ -0,0 +1,117 @@
+"""Keyset (cursor) pagination for internship listings
+
+Each page is fetched with `WHERE (sort_key, id) > last_seen ORDER BY sort_key, id
+LIMIT n`, so the cost of a page doesn't grow with how deep into the table it is.
+The cursor handed to clients is an opaque base64 string encoding the sort
+name, the last row's sort key and its id.
+
+`columns` is anything exposing the listing columns as attributes: the
+InternshipListing model (the default) or the `.c` of a subquery such as
+the hot + archive union from shared/database/archive.py.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import and_, or_
+from datetime import datetime
+import base64
+import json
+
+from shared.database.database import InternshipListing
+
+# sort name -> (column name, descending, nullable); every listing column can be NULL
+SORTS = {
+    "relevance": ("relevance_score", True, True),
+    "posted": ("age_days", False, True),  # newest posts = lowest age_days
+    "date": ("discovered_at", True, True),
+    "company": ("company", False, True),
+}
+DEFAULT_SORT = "relevance"
+
+
+def encode_cursor(sort, row):
+    """Build an opaque cursor pointing just after row"""
+    name, _, _ = SORTS[sort]
+    value = getattr(row, name)
+    if isinstance(value, datetime):
+        value = {"dt": value.isoformat()}
+    payload = json.dumps({"s": sort, "k": value, "id": row.id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor, sort):
+    """Return (sort_key, id) from a cursor; raises ValueError if it's invalid"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        value, last_id = payload["k"], int(payload["id"])
+        if isinstance(value, dict):
+            value = datetime.fromisoformat(value["dt"])
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+    if payload.get("s") != sort:
+        raise ValueError("Cursor was issued for a different sort order")
+    return value, last_id
+
+
+def _after(column, id_col, descending, nullable, value, last_id):
+    """Filter selecting rows that come strictly after (value, last_id)"""
+
+    # NULLs sort last, after every non-NULL key, and by id in the sort's direction among themselves
+    if nullable and value is None:
+        return and_(column.is_(None), id_col < last_id if descending else id_col > last_id)
+
+    if descending:
+        beyond, tie = column < value, and_(column == value, id_col < last_id)
+    else:
+        beyond, tie = column > value, and_(column == value, id_col > last_id)
+
+    if nullable:
+        return or_(beyond, tie, column.is_(None))
+    return or_(beyond, tie)
+
+
+def keyset_page(query, sort=DEFAULT_SORT, limit=50, cursor=None, columns=InternshipListing):
+    """Apply keyset filter, ordering and limit to a Query or select()"""
+    if sort not in SORTS:
+        sort = DEFAULT_SORT
+    name, descending, nullable = SORTS[sort]
+    column, id_col = getattr(columns, name), columns.id
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort)
+        query = query.filter(_after(column, id_col, descending, nullable, value, last_id))
+
+    key_order = column.desc() if descending else column.asc()
+    if nullable:
+        key_order = key_order.nullslast()
+    order = (key_order, id_col.desc() if descending else id_col.asc())
+
+    # Fetch one extra row to know whether another page exists
+    return query.order_by(*order).limit(limit + 1), sort
+
+
+def split_page(rows, sort, limit):
+    """Trim the look-ahead row and build the next cursor; returns (rows, next_cursor)"""
+    rows = list(rows)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, encode_cursor(sort, rows[-1])
+    return rows, None
+
+
+def paginate(query, sort=DEFAULT_SORT, limit=50, cursor=None, columns=InternshipListing):
+    """Run a keyset-paginated Query; returns (rows, next_cursor)"""
+    query, sort = keyset_page(query, sort, limit, cursor, columns)
+    return split_page(query.all(), sort, limit)
+
+
+async def paginate_async(session, statement, sort=DEFAULT_SORT, limit=50, cursor=None,
+                         columns=InternshipListing, scalars=True):
+    """Run a keyset-paginated select() on an AsyncSession; returns (rows, next_cursor)"""
+    statement, sort = keyset_page(statement, sort, limit, cursor, columns)
+    result = await session.execute(statement)
+    rows = result.scalars().all() if scalars else result.all()
+    return split_page(rows, sort, limit)
@@ -0,0 +1,88 @@
+"""Full-text search over internship listings backed by SQLite FTS5
+
+The `internship_listings_fts` index is created and kept in sync by
+migration 2 in shared/database/migrations.py.
+
+Query syntax:
+    python backend          both terms, any order
+    "machine learning"      exact phrase
+    data*                   prefix match (data, database, dataset, ...)
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text, column, Integer
+import re
+
+# Relative bm25 weights for the title, company and description columns
+BM25_WEIGHTS = (10.0, 5.0, 1.0)
+
+_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+
+
+def build_match_query(search):
+    """Turn free-form user input into a safe FTS5 MATCH expression"""
+    terms = []
+    for phrase, word in _TOKEN_RE.findall(search or ""):
+        if phrase:
+            phrase = phrase.strip()
+            if phrase:
+                terms.append('"' + phrase.replace('"', '""') + '"')
+            continue
+
+        prefix = word.endswith("*")
+        word = word.rstrip("*").replace('"', '')
+        if not word:
+            continue
+
+        # Quote every term so characters like + - : ( ) aren't parsed as operators
+        terms.append(f'"{word}"' + ("*" if prefix else ""))
+
+    return " ".join(terms)
+
+
+def matching_ids(match_query):
+    """Subquery of listing ids matching an FTS5 expression, for use with .in_()"""
+    return text(
+        "SELECT rowid FROM internship_listings_fts WHERE internship_listings_fts MATCH :match_query"
+    ).bindparams(match_query=match_query).columns(column("rowid", Integer))
+
+
+def _search_statement(search, limit, snippet_start, snippet_end):
+    """Build the ranked FTS query and its parameters, or None for an empty search"""
+    match_query = build_match_query(search)
+    if not match_query:
+        return None, None
+
+    title_w, company_w, description_w = BM25_WEIGHTS
+    statement = text(f"""
+        SELECT l.id, l.title, l.company, l.location, l.url, l.application_status,
+               l.relevance_score,
+               snippet(internship_listings_fts, -1, :start, :end, '...', 16) AS snippet,
+               bm25(internship_listings_fts, {title_w}, {company_w}, {description_w}) AS rank
+        FROM internship_listings_fts
+        JOIN internship_listings l ON l.id = internship_listings_fts.rowid
+        WHERE internship_listings_fts MATCH :match_query
+        ORDER BY rank
+        LIMIT :limit
+    """)
+    params = {"match_query": match_query, "start": snippet_start, "end": snippet_end, "limit": limit}
+    return statement, params
+
+
+def search_internships(session, search, limit=20, snippet_start="[", snippet_end="]"):
+    """Return bm25-ranked listings matching the search with a highlighted snippet"""
+    statement, params = _search_statement(search, limit, snippet_start, snippet_end)
+    if statement is None:
+        return []
+    return [dict(row) for row in session.execute(statement, params).mappings().all()]
+
+
+async def search_internships_async(session, search, limit=20, snippet_start="[", snippet_end="]"):
+    """search_internships() for an AsyncSession"""
+    statement, params = _search_statement(search, limit, snippet_start, snippet_end)
+    if statement is None:
+        return []
+    result = await session.execute(statement, params)
+    return [dict(row) for row in result.mappings().all()]
@@ -0,0 +1,133 @@
+"""Incrementally maintained listing counters for /api/stats
+
+Triggers on internship_listings (migration 3) and its archive (migration
+5) keep `listing_stats` up to date on every insert, delete and status
+change, whichever process makes it. Archived listings are still counted,
+so moving one to the archive leaves every counter unchanged. Keys are:
+
+    total                   all listings, active and archived
+    status:<status>         listings per application_status
+    day:<YYYY-MM-DD>        listings discovered on that (UTC) day
+
+Reading the dashboard stats is then a handful of primary-key lookups.
+`reconcile_stats()` rebuilds the table from scratch to correct any drift;
+run it from cron with `python shared/database/stats.py`.
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from sqlalchemy import text
+from datetime import datetime, timedelta
+
+_ALL_LISTINGS = """(
+    SELECT application_status, discovered_at FROM internship_listings
+    UNION ALL
+    SELECT application_status, discovered_at FROM internship_listings_archive
+)"""
+
+# Full rebuild of listing_stats from the active and archived listings
+REBUILD_STATS_SQL = [
+    "DELETE FROM listing_stats",
+    f"INSERT INTO listing_stats (key, value) SELECT 'total', COUNT(*) FROM {_ALL_LISTINGS}",
+    f"""INSERT INTO listing_stats (key, value)
+       SELECT 'status:' || COALESCE(application_status, 'not_applied'), COUNT(*)
+       FROM {_ALL_LISTINGS} GROUP BY 1""",
+    f"""INSERT INTO listing_stats (key, value)
+       SELECT 'day:' || COALESCE(date(discovered_at), 'unknown'), COUNT(*)
+       FROM {_ALL_LISTINGS} GROUP BY 1""",
+]
+
+
+def _bump(sign, row):
+    """Trigger statements adding sign (+1/-1) to every counter row touches"""
+    keys = [
+        "'total'",
+        f"'status:' || COALESCE({row}.application_status, 'not_applied')",
+        f"'day:' || COALESCE(date({row}.discovered_at), 'unknown')",
+    ]
+    return "\n".join(
+        f"INSERT INTO listing_stats (key, value) VALUES ({key}, {sign}) "
+        f"ON CONFLICT(key) DO UPDATE SET value = value + ({sign});"
+        for key in keys
+    )
+
+
+def _stats_triggers(table, prefix):
+    """Insert, delete and update triggers keeping listing_stats in step with table"""
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS {prefix}_ai AFTER INSERT ON {table} BEGIN
+            {_bump(1, 'new')}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {prefix}_ad AFTER DELETE ON {table} BEGIN
+            {_bump(-1, 'old')}
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {prefix}_au
+        AFTER UPDATE OF application_status, discovered_at ON {table} BEGIN
+            {_bump(-1, 'old')}
+            {_bump(1, 'new')}
+        END""",
+    ]
+
+
+STATS_SCHEMA_SQL = [
+    """CREATE TABLE IF NOT EXISTS listing_stats (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL DEFAULT 0
+    )""",
+    *_stats_triggers("internship_listings", "listing_stats"),
+]
+
+ARCHIVE_STATS_SQL = _stats_triggers("internship_listings_archive", "listing_stats_archive")
+
+
+_STATS_QUERY = text("""
+    SELECT key, value FROM listing_stats
+    WHERE key IN ('total', 'status:applied', 'status:interviewing')
+    UNION ALL
+    SELECT 'this_week', COALESCE(SUM(value), 0) FROM listing_stats
+    WHERE key BETWEEN :week_start AND 'day:9999-12-31'
+""")
+
+
+def _stats_params():
+    week_start = (datetime.utcnow() - timedelta(days=6)).strftime("%Y-%m-%d")
+    return {"week_start": f"day:{week_start}"}
+
+
+def _stats_from_rows(rows):
+    rows = dict(rows)
+    return {
+        "total": rows.get("total", 0),
+        "applied": rows.get("status:applied", 0),
+        "interviewing": rows.get("status:interviewing", 0),
+        "this_week": rows.get("this_week", 0)
+    }
+
+
+def get_stats(session):
+    """Read dashboard counters: total, applied, interviewing and this_week"""
+    return _stats_from_rows(session.execute(_STATS_QUERY, _stats_params()).all())
+
+
+async def get_stats_async(session):
+    """get_stats() for an AsyncSession"""
+    result = await session.execute(_STATS_QUERY, _stats_params())
+    return _stats_from_rows(result.all())
+
+
+def reconcile_stats():
+    """Recompute every counter from the active and archived listings"""
+    from shared.database.writer import run_write
+
+    def _rebuild(session):
+        for statement in REBUILD_STATS_SQL:
+            session.execute(text(statement))
+        return get_stats(session)
+
+    return run_write(_rebuild)
+
+
+if __name__ == "__main__":
+    stats = reconcile_stats()
+    print(f"[Stats] Reconciled: {stats}")
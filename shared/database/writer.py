@@ -0,0 +1,91 @@
+"""Serialized database writer
+
+SQLite allows one writer at a time. Instead of letting every request
+thread open its own write transaction and race for the lock, writes are
+handed to a single queue-fed thread that runs them one after another.
+Readers use ordinary sessions and, with WAL enabled, never wait on it.
+
+    from shared.database.writer import run_write
+
+    def _apply(session):
+        session.query(InternshipListing).get(1).applied = True
+
+    run_write(_apply)           # blocks until committed, returns _apply's result
+    future = submit_write(_apply)  # fire-and-forget, returns a Future
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from concurrent.futures import Future
+import queue
+import threading
+
+from shared.database.database import get_db_session
+
+
+class DatabaseWriter:
+    """Runs write callables on one background thread, one transaction each"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            fn, future = self._queue.get()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._execute(fn))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def _execute(self, fn):
+        session = get_db_session()
+        try:
+            result = fn(session)
+            session.commit()
+            return result
+        except BaseException:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+    def submit(self, fn):
+        """Queue fn(session) for the writer thread and return a Future"""
+        # A write issued from inside another write runs inline to avoid deadlock
+        if threading.current_thread() is self._thread:
+            future = Future()
+            future.set_result(self._execute(fn))
+            return future
+
+        self._ensure_started()
+        future = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def run(self, fn, timeout=None):
+        """Run fn(session) on the writer thread and wait for its result"""
+        return self.submit(fn).result(timeout=timeout)
+
+
+_writer = DatabaseWriter()
+
+
+def submit_write(fn):
+    """Queue a write on the process-wide writer"""
+    return _writer.submit(fn)
+
+
+def run_write(fn, timeout=None):
+    """Run a write on the process-wide writer and wait for it"""
+    return _writer.run(fn, timeout=timeout)
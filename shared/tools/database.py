@@ -2,9 +2,41 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from shared.database.database import get_db_session, InternshipListing, save_internship
+from shared.database.database import get_db_session, InternshipListing, InternshipListingArchive, save_internship
+from shared.database.archive import listings_with_archive
+from shared.database.search import search_internships
+from shared.database.writer import run_write
 from shared.tools.base import BaseTool
+from sqlalchemy import insert, select
 from datetime import datetime
+from itertools import islice
+
+def fetch_existing_keys(session, candidates, chunk_size=400):
+    """Load url and (title, company) keys already stored (active or archived) for this batch"""
+    urls = list({row['url'] for row in candidates})
+    titles = list({row['title'] for row in candidates})
+    known_urls = set()
+    known_pairs = set()
+
+    # Archived listings still count, otherwise they'd be re-imported next run
+    for model in (InternshipListing, InternshipListingArchive):
+        # Chunked to stay under SQLite's bound-parameter limit
+        for i in range(0, max(len(urls), len(titles)), chunk_size):
+            rows = session.query(
+                model.url,
+                model.title,
+                model.company
+            ).filter(
+                model.url.in_(urls[i:i + chunk_size]) |
+                model.title.in_(titles[i:i + chunk_size])
+            ).all()
+
+            for url, title, company in rows:
+                known_urls.add(url)
+                known_pairs.add((title, company))
+
+    return known_urls, known_pairs
+
 
 class DatabaseTool(BaseTool):
     name = "save_to_database"
@@ -23,10 +55,8 @@ class DatabaseTool(BaseTool):
                     }
                 }
             
-            session = get_db_session()
-            saved_count = 0
-            duplicate_count = 0
-            
+            # Normalize incoming rows, skipping anything we can't save
+            candidates = []
             for internship_data in internships:
                 # Handle both dict objects and string placeholders
                 if isinstance(internship_data, str):
@@ -43,7 +73,6 @@ class DatabaseTool(BaseTool):
                 url = internship_data.get('url', '')
                 location = internship_data.get('location', '')
                 description = internship_data.get('description', '')
-                source = internship_data.get('source', 'GitHub')
                 age_days = internship_data.get('age_days')
                 
                 # Skip if missing essential data
@@ -51,39 +80,62 @@ class DatabaseTool(BaseTool):
                     print(f"[Database] Skipping incomplete internship: {internship_data}")
                     continue
                 
-                # Check for duplicates by URL or title+company combination
-                existing = session.query(InternshipListing).filter(
-                    (InternshipListing.url == url) |
-                    ((InternshipListing.title == title) & (InternshipListing.company == company))
-                ).first()
+                candidates.append({
+                    'title': title,
+                    'company': company,
+                    'url': url,
+                    'location': location,
+                    'description': description[:500] if description else "",
+                    'age_days': int(age_days) if age_days else None
+                })
+            
+            def _ingest(session):
+                # One prefetch of the keys that could collide with this batch
+                known_urls, known_pairs = fetch_existing_keys(session, candidates)
                 
-                if existing:
-                    duplicate_count += 1
-                    print(f"[Database] Duplicate found: {title} at {company}")
-                    continue
+                new_rows = []
+                duplicate_count = 0
+                now = datetime.utcnow()
                 
-                # Create new internship record
-                new_internship = InternshipListing(
-                    agent_job_id=agent_job_id or "multi_agent",
-                    title=title,
-                    company=company,
-                    url=url,
-                    location=location,
-                    description=description[:500] if description else "",
-                    requirements="",
-                    deadline="",
-                    application_status="not_applied",
-                    applied=False,
-                    discovered_at=datetime.utcnow(),
-                    age_days=int(age_days) if age_days else None
-                )
+                for row in candidates:
+                    pair = (row['title'], row['company'])
+                    
+                    # Check for duplicates by URL or title+company combination
+                    if row['url'] in known_urls or pair in known_pairs:
+                        duplicate_count += 1
+                        print(f"[Database] Duplicate found: {row['title']} at {row['company']}")
+                        continue
+                    
+                    known_urls.add(row['url'])
+                    known_pairs.add(pair)
+                    new_rows.append({
+                        'agent_job_id': agent_job_id or "multi_agent",
+                        'requirements': "",
+                        'deadline': "",
+                        'application_status': "not_applied",
+                        'applied': False,
+                        'discovered_at': now,
+                        'relevance_score': 0.0,
+                        'interest_level': 0,
+                        **row
+                    })
                 
-                session.add(new_internship)
-                saved_count += 1
-                print(f"[Database] Saved: {title} at {company}")
+                if not new_rows:
+                    return 0, duplicate_count
+                
+                # Single executemany; OR IGNORE covers rows inserted by other processes since the prefetch,
+                # and the Core insert's rowcount counts only the rows that actually went in
+                result = session.execute(
+                    insert(InternshipListing.__table__).prefix_with("OR IGNORE"),
+                    new_rows
+                )
+                saved_count = result.rowcount
+                duplicate_count += len(new_rows) - saved_count
+                print(f"[Database] Saved {saved_count} new internships")
+                return saved_count, duplicate_count
             
-            session.commit()
-            session.close()
+            # Key check and insert run as one transaction on the writer thread
+            saved_count, duplicate_count = run_write(_ingest)
             
             return {
                 "success": True,
@@ -101,27 +153,60 @@ class DatabaseTool(BaseTool):
                 "error": str(e)
             }
 
+    def save_stream(self, internships, agent_job_id=None, chunk_size=200):
+        """Save an iterable of internships chunk by chunk as it's produced"""
+        totals = {"saved_count": 0, "duplicate_count": 0, "total_processed": 0}
+        internships = iter(internships)
+
+        while True:
+            chunk = list(islice(internships, chunk_size))
+            if not chunk:
+                break
+
+            # Each chunk commits on its own, so early rows land while later ones are still being fetched
+            result = self.execute(chunk, agent_job_id=agent_job_id)
+            if not result["success"]:
+                return result
+
+            for key in totals:
+                totals[key] += result["data"][key]
+            print(f"[Database] Chunk saved: {result['data']['saved_count']} new, {totals['total_processed']} processed so far")
+
+        return {
+            "success": True,
+            "data": totals
+        }
+
 
 class DatabaseQueryTool(BaseTool):
     name = "query_database"
-    description = "Query database for internships. Args: {'action': 'recent'|'search'|'unapplied', 'limit': 10, 'query': 'search_term'}"
+    description = "Query database for internships. Args: {'action': 'recent'|'search'|'unapplied', 'limit': 10, 'query': 'search terms, \"exact phrase\" or prefix*', 'include_archived': False}"
     
-    def execute(self, action="recent", limit=10, query=None):
+    def execute(self, action="recent", limit=10, query=None, include_archived=False):
         """Query internships from database"""
         try:
             session = get_db_session()
             
-            if action == "recent":
+            if action == "recent" and include_archived:
+                listings = listings_with_archive()
+                internships = session.execute(
+                    select(listings).order_by(listings.c.discovered_at.desc()).limit(limit)
+                ).all()
+            
+            elif action == "recent":
                 internships = session.query(InternshipListing).order_by(
                     InternshipListing.discovered_at.desc()
                 ).limit(limit).all()
             
             elif action == "search" and query:
-                internships = session.query(InternshipListing).filter(
-                    (InternshipListing.title.contains(query)) |
-                    (InternshipListing.company.contains(query)) |
-                    (InternshipListing.description.contains(query))
-                ).limit(limit).all()
+                # Ranked full-text hits, in rank order, with their snippets as an extra key
+                hits = search_internships(session, query, limit=limit)
+                snippets = {hit["id"]: hit["snippet"] for hit in hits}
+                by_id = {
+                    internship.id: internship
+                    for internship in session.query(InternshipListing).filter(InternshipListing.id.in_(snippets))
+                }
+                internships = [by_id[hit["id"]] for hit in hits if hit["id"] in by_id]
             
             elif action == "unapplied":
                 internships = session.query(InternshipListing).filter_by(
@@ -143,6 +228,8 @@ class DatabaseQueryTool(BaseTool):
                     "discovered_at": internship.discovered_at.strftime("%Y-%m-%d"),
                     "applied": internship.applied
                 })
+                if action == "search":
+                    result[-1]["snippet"] = snippets[internship.id]
             
             session.close()
             
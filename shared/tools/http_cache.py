@@ -0,0 +1,68 @@
+"""HTTP validator cache for conditional GETs
+
+Stores the ETag / Last-Modified validators of a response together with
+whatever the caller parsed out of it, one small JSON file per URL. The
+next request for that URL sends If-None-Match / If-Modified-Since; on a
+304 the caller reuses the stored parsed result instead of downloading
+and parsing again. GitHub doesn't count 304s against the API rate limit.
+"""
+import os
+import json
+import hashlib
+import threading
+import tempfile
+
+
+def get_cache_dir():
+    """Scout cache directory (project ./cache unless SCOUT_CACHE_DIR is set)"""
+    project_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.getenv("SCOUT_CACHE_DIR", os.path.join(project_dir, "cache"))
+
+
+class HTTPValidatorCache:
+    """Per-URL ETag/Last-Modified plus the parsed payload from the last 200"""
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or os.path.join(get_cache_dir(), "http")
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode()).hexdigest() + ".json")
+
+    def get(self, url):
+        """Return the cached entry for url, or None"""
+        try:
+            with open(self._path(url)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, url):
+        """Validator headers to send with the next request for url"""
+        entry = self.get(url)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, response, parsed):
+        """Remember response's validators with the parsed result"""
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        entry = {"url": url, "etag": etag, "last_modified": last_modified, "parsed": parsed}
+
+        # Write to a temp file and rename so readers never see a partial entry
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(url))
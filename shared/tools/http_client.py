@@ -0,0 +1,159 @@
+"""Shared HTTP client: pooled keep-alive sessions, retries, timeouts, response cache
+
+Every scout and notifier goes through one of these clients instead of bare
+`requests.get`/`requests.post`, so connections (and their TLS sessions)
+are reused across calls.
+
+- One requests.Session per host, with a connection pool of HTTP_POOL_SIZE.
+- Connection errors are retried HTTP_RETRIES times with exponential backoff
+  (HTTP_BACKOFF seconds base). 5xx responses are retried only for GET/HEAD,
+  so a POST is never sent twice.
+- Every request has a timeout: HTTP_CONNECT_TIMEOUT for connecting and the
+  caller's timeout (default HTTP_TIMEOUT) for reading.
+- GETs can opt into an in-memory response cache with `cache_ttl=seconds`.
+  The cache holds at most HTTP_CACHE_MAX_ENTRIES responses and evicts the
+  least recently used.
+
+    from shared.tools.http_client import get_http_client
+
+    http = get_http_client()
+    response = http.get(url, timeout=15)
+
+Named clients (`get_http_client("ats", retry_statuses=(500, 502, 504))`)
+get their own settings and pools. A caller that handles 429/503 itself
+passes retry_after=False too: urllib3 otherwise still retries (and sleeps
+on) any 429/503 that carries a Retry-After header, listed or not.
+"""
+import os
+import time
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HTTPClient:
+    """Pooled per-host sessions with retry, timeouts and an optional TTL cache"""
+
+    def __init__(self, retries=None, backoff=None, timeout=None, pool_size=None,
+                 retry_statuses=(500, 502, 503, 504), retry_after=True, cache_max_entries=None):
+        self.retries = retries if retries is not None else int(os.getenv("HTTP_RETRIES", "3"))
+        self.backoff = backoff if backoff is not None else float(os.getenv("HTTP_BACKOFF", "0.5"))
+        self.timeout = timeout if timeout is not None else float(os.getenv("HTTP_TIMEOUT", "15"))
+        self.connect_timeout = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+        self.pool_size = pool_size if pool_size is not None else int(os.getenv("HTTP_POOL_SIZE", "10"))
+        self.retry_statuses = tuple(retry_statuses)
+        self.retry_after = retry_after  # Let urllib3 retry 413/429/503 responses with Retry-After
+        self.cache_max_entries = cache_max_entries if cache_max_entries is not None else int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "256"))
+
+        self._sessions = {}
+        self._cache = OrderedDict()  # key -> (expires_at, response)
+        self._lock = threading.Lock()
+
+    def _new_session(self):
+        retry = Retry(
+            total=self.retries,
+            connect=self.retries,
+            read=self.retries,
+            status=self.retries,
+            backoff_factor=self.backoff,
+            status_forcelist=self.retry_statuses,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=self.retry_after,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def session(self, url):
+        """Keep-alive session for url's host"""
+        parsed = urlparse(url)
+        host = (parsed.scheme, parsed.netloc)
+        with self._lock:
+            if host not in self._sessions:
+                self._sessions[host] = self._new_session()
+            return self._sessions[host]
+
+    def request(self, method, url, timeout=None, cache_ttl=None, **kwargs):
+        """Send a request; GETs with cache_ttl are served from cache while fresh"""
+        timeout = timeout if timeout is not None else self.timeout
+        if not isinstance(timeout, tuple):
+            timeout = (min(self.connect_timeout, timeout), timeout)
+
+        key = None
+        if cache_ttl and method.upper() == "GET":
+            key = self._cache_key(url, kwargs)
+            cached = self._cache_get(key)
+            if cached is not None:
+                return cached
+
+        response = self.session(url).request(method, url, timeout=timeout, **kwargs)
+
+        if key and response.status_code == 200:
+            self._cache_put(key, response, cache_ttl)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    @staticmethod
+    def _cache_key(url, kwargs):
+        # params may be a dict (with list values), a list of pairs or a query string
+        params = kwargs.get("params") or {}
+        if isinstance(params, bytes):
+            params = params.decode()
+        query = params if isinstance(params, str) else urlencode(params, doseq=True)
+        headers = kwargs.get("headers") or {}
+        return (url, tuple(sorted(query.split("&"))), tuple(sorted(headers.items())))
+
+    def _cache_get(self, key):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            expires_at, response = entry
+            if time.monotonic() >= expires_at:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return response
+
+    def _cache_put(self, key, response, ttl):
+        response.content  # Read the body now so the cached response doesn't hold a connection
+        with self._lock:
+            self._cache[key] = (time.monotonic() + ttl, response)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_max_entries:
+                self._cache.popitem(last=False)
+
+    def clear_cache(self):
+        with self._lock:
+            self._cache.clear()
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._cache.clear()
+
+
+_clients = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(name="default", **settings):
+    """Process-wide HTTPClient for name; settings apply when it's first created"""
+    with _clients_lock:
+        if name not in _clients:
+            _clients[name] = HTTPClient(**settings)
+        return _clients[name]
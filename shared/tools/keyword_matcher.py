@@ -0,0 +1,86 @@
+"""Compiled multi-keyword matching on word boundaries
+
+A KeywordMatcher compiles a keyword set once into a single regex whose
+alternation is factored as a trie (so the engine tries each prefix once,
+close to Aho-Corasick). It runs over lowercased text and is anchored so a
+keyword only matches as a whole word: "fall" matches "Fall 2026 Intern"
+but not "Waterfall", and "go" doesn't match "Google". Plurals have to be
+listed as keywords of their own; plurals=True instead allows a trailing
+"s"/"es" on every keyword, which also lets "go" match "goes" and "fall"
+match "Falls". Spaces in a keyword match any whitespace.
+With digits=True a digit counts as a boundary too, so "summer" also
+matches "Summer2026" (titles often run the season into the year).
+
+    matcher = KeywordMatcher(["intern", "interns", "co-op", "new grad"])
+    matcher.matches("Software Engineering Interns")   # {'interns'}
+    matcher.classify(titles)                          # one hit set per title
+
+Keywords may contain symbols ("c++", "ci/cd"); matching is on the
+characters around them, not on regex word boundaries.
+"""
+import re
+
+
+def _trie_pattern(keywords):
+    """Regex alternation for keywords with shared prefixes factored out; longer matches win"""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Which of a fixed set of keywords occur in a text, compiled once"""
+
+    def __init__(self, keywords, plurals=False, digits=False):
+        self.keywords = sorted({" ".join(keyword.lower().split()) for keyword in keywords if keyword.strip()})
+        suffix = "(?:e?s)?" if plurals else ""
+        word = r"[^\W\d]" if digits else r"\w"  # What may not touch a keyword: letters/_ (and digits unless digits=True)
+        self.pattern = re.compile(rf"(?<!{word})({_trie_pattern(self.keywords)}){suffix}(?!{word})") if self.keywords else None
+        self._spaced = any(" " in keyword for keyword in self.keywords)  # Hits may need whitespace normalized
+
+    def _hits(self, text):
+        found = self.pattern.findall(text.lower())
+        if self._spaced:
+            return {" ".join(keyword.split()) for keyword in found}
+        return set(found)
+
+    def matches(self, text):
+        """Set of keywords found in text"""
+        if not self.pattern or not text:
+            return set()
+        return self._hits(text)
+
+    def search(self, text):
+        """True if any keyword occurs in text"""
+        return bool(self.pattern and text and self.pattern.search(text.lower()))
+
+    def count(self, text):
+        """Number of distinct keywords found in text"""
+        return len(self.matches(text))
+
+    def classify(self, texts):
+        """Hit sets for a batch of texts, in order"""
+        if not self.pattern:
+            return [set() for _ in texts]
+        hits = self._hits
+        return [hits(text) if text else set() for text in texts]
+
+    def filter(self, texts):
+        """Indexes of the texts with at least one keyword"""
+        search = self.pattern.search if self.pattern else None
+        return [i for i, text in enumerate(texts) if search and text and search(text.lower())]
@@ -0,0 +1,102 @@
+"""On-disk cache of parsed listing sets keyed by source content hash
+
+Cron runs, Telegram /check, ad-hoc agent jobs and scripts often download a
+README whose content hasn't changed since another process parsed it. The
+parsed listings are stored under a hash of the content (plus the parser
+used), so any process can skip parsing that exact content again.
+
+Entries expire after PARSE_CACHE_TTL_SECONDS. When the cache grows past
+PARSE_CACHE_MAX_MB the least recently used entries are evicted; reading
+an entry refreshes its mtime.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+import tempfile
+
+from shared.tools.http_cache import get_cache_dir
+
+
+def content_key(content, *parts):
+    """Cache key for content as parsed by parts (e.g. the parser type)"""
+    digest = hashlib.sha256(content.encode()).hexdigest()
+    return "-".join([digest, *parts])
+
+
+class ParseCache:
+    """Parsed results per content key, with TTL and a size-bounded LRU"""
+
+    def __init__(self, cache_dir=None, ttl=None, max_bytes=None):
+        self.cache_dir = cache_dir or os.path.join(get_cache_dir(), "parsed")
+        self.ttl = ttl if ttl is not None else int(os.getenv("PARSE_CACHE_TTL_SECONDS", "86400"))
+        self.max_bytes = max_bytes if max_bytes is not None else int(float(os.getenv("PARSE_CACHE_MAX_MB", "50")) * 1024 * 1024)
+        self._lock = threading.Lock()
+        self._size = None  # Bytes on disk as of the last scan plus what we've written since
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key + ".json")
+
+    def get(self, key):
+        """Return the cached value for key, or None if missing or expired"""
+        path = self._path(key)
+        try:
+            if time.time() - os.path.getmtime(path) > self.ttl:
+                os.remove(path)
+                return None
+            with open(path) as f:
+                value = json.load(f)
+            os.utime(path)  # Mark as recently used
+            return value
+        except (OSError, ValueError):
+            return None
+
+    def put(self, key, value):
+        """Store value under key, then evict old entries if over the size bound"""
+        with self._lock:
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "w") as f:
+                json.dump(value, f)
+                written = f.tell()
+            os.replace(tmp_path, self._path(key))
+
+            # Only rescan the directory when we may have gone over the bound
+            if self._size is not None:
+                self._size += written
+            if self._size is None or self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least recently used ones until 10% under max_bytes"""
+        entries = []
+        now = time.time()
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.ttl:
+                self._remove(path)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            # Leave headroom so the next few puts don't each trigger a rescan
+            if total <= self.max_bytes * 0.9:
+                break
+            self._remove(path)
+            total -= size
+        self._size = total
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,104 @@
+"""Per-host token-bucket rate limiting for outbound HTTP
+
+Each host gets a bucket refilled at `rate` requests per second, holding at
+most `burst` tokens. Callers block in acquire() until their host has a
+token, so concurrent workers stay polite without fixed sleeps.
+
+When a host answers 429/503, backoff() pauses its bucket for the
+Retry-After period and halves its rate. Each later success restores the
+rate a little at a time until it's back at the configured value.
+"""
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from urllib.parse import urlparse
+
+
+def parse_retry_after(value, default=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    """Blocking token bucket with adaptive rate"""
+
+    def __init__(self, rate, burst=1, min_rate=0.05):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.min_rate = min(min_rate, rate)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                else:
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def backoff(self, delay):
+        """Pause for delay seconds and halve the rate"""
+        with self._lock:
+            now = time.monotonic()
+            self.paused_until = max(self.paused_until, now + delay)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            self.updated = max(now, self.paused_until)
+
+    def success(self):
+        """Recover towards the configured rate after a good response"""
+        with self._lock:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate / 10)
+
+
+class HostRateLimiter:
+    """A TokenBucket per host, created on first use"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._buckets:
+                self._buckets[host] = TokenBucket(self.rate, self.burst)
+            return self._buckets[host]
+
+    def acquire(self, url):
+        self.bucket(url).acquire()
+
+    def backoff(self, url, delay):
+        self.bucket(url).backoff(delay)
+
+    def success(self, url):
+        self.bucket(url).success()
@@ -1,6 +1,7 @@
 import os
-import requests
+from requests.exceptions import Timeout
 from .base import BaseTool
+from .http_client import get_http_client
 
 
 class TelegramTool(BaseTool):
@@ -30,7 +31,7 @@ class TelegramTool(BaseTool):
             if parse_mode:
                 payload["parse_mode"] = parse_mode
 
-            response = requests.post(
+            response = get_http_client().post(
                 f"{self.base_url}/sendMessage",
                 json=payload,
                 timeout=10
@@ -47,7 +48,7 @@ class TelegramTool(BaseTool):
                     "error": f"Telegram API error: {response.text}"
                 }
 
-        except requests.Timeout:
+        except Timeout:
             return {
                 "success": False,
                 "error": "Telegram request timed out"
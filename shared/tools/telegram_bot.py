@@ -1,4 +1,8 @@
+import sys
 import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from shared.tools.http_client import get_http_client
 import requests
 import time
 import subprocess
@@ -13,6 +17,9 @@ class TelegramBot:
         self.bot_token = os.getenv("TELEGRAM_BOT_TOKEN")
         self.chat_id = os.getenv("TELEGRAM_CHAT_ID")
         self.base_url = f"https://api.telegram.org/bot{self.bot_token}" if self.bot_token else None
+        self.http = get_http_client()
+        # Local services: a health check shouldn't wait on retries of a refused connection
+        self.local_http = get_http_client("local", retries=0)
         self.last_update_id = 0
         self.running = False
 
@@ -31,7 +38,7 @@ class TelegramBot:
             return False
 
         try:
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/sendMessage",
                 json={
                     "chat_id": self.chat_id,
@@ -51,7 +58,7 @@ class TelegramBot:
             return []
 
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/getUpdates",
                 params={
                     "offset": self.last_update_id + 1,
@@ -115,21 +122,21 @@ class TelegramBot:
 
         # Check Ollama
         try:
-            r = requests.get("http://localhost:11434/api/tags", timeout=5)
+            r = self.local_http.get("http://localhost:11434/api/tags", timeout=5)
             checks.append(("Ollama", r.status_code == 200))
         except:
             checks.append(("Ollama", False))
 
         # Check API
         try:
-            r = requests.get("http://localhost:8000/", timeout=5)
+            r = self.local_http.get("http://localhost:8000/", timeout=5)
             checks.append(("AI Agent API", r.status_code == 200))
         except:
             checks.append(("AI Agent API", False))
 
         # Check Dashboard
         try:
-            r = requests.get("http://localhost:8001/", timeout=5)
+            r = self.local_http.get("http://localhost:8001/", timeout=5)
             checks.append(("Dashboard", r.status_code == 200))
         except:
             checks.append(("Dashboard", False))
@@ -152,7 +159,7 @@ class TelegramBot:
 
         try:
             # Get API info
-            r = requests.get("http://localhost:8000/", timeout=5)
+            r = self.local_http.get("http://localhost:8000/", timeout=5)
             api_info = r.json() if r.status_code == 200 else {}
 
             # Count internships in database
@@ -160,11 +167,12 @@ class TelegramBot:
             # Use project directory for consistency
             project_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
             db_path = os.path.join(project_dir, "internships.db")
-            conn = sqlite3.connect(db_path)
+            # Read-only with a busy timeout so a running workflow never blocks us
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=5)
             cursor = conn.cursor()
             cursor.execute("SELECT COUNT(*) FROM internship_listings")
             total_internships = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM internship_listings WHERE status = 'applied'")
+            cursor.execute("SELECT COUNT(*) FROM internship_listings WHERE application_status = 'applied'")
             applied = cursor.fetchone()[0]
             conn.close()
 
@@ -188,7 +196,7 @@ class TelegramBot:
         self.send_message("🔍 Starting internship discovery...\n\nThis may take a few minutes.")
 
         try:
-            r = requests.post(
+            r = self.local_http.post(
                 "http://localhost:8000/run-workflow",
                 timeout=600  # 10 min timeout
             )
@@ -221,26 +229,19 @@ Duplicates: {data.get('duplicates_filtered', 'N/A')}
         self.send_message("💾 Creating backup...")
 
         try:
-            # Use project directory for consistency
-            project_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            db_path = os.path.join(project_dir, "internships.db")
-            backup_dir = os.path.join(project_dir, "backups")
-            os.makedirs(backup_dir, exist_ok=True)
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = f"{backup_dir}/internships_{timestamp}.db"
-
-            # Copy database
-            import shutil
-            shutil.copy2(db_path, backup_path)
+            # Online, page-stepped snapshot; safe while the workflow is writing
+            from shared.database.backup import create_backup
+            result = create_backup()
 
-            # Get file size
-            size_mb = os.path.getsize(backup_path) / (1024 * 1024)
+            size_mb = result["size_bytes"] / (1024 * 1024)
+            raw_mb = result["raw_size_bytes"] / (1024 * 1024)
 
             msg = f"""✅ <b>Backup Complete</b>
 
-File: <code>internships_{timestamp}.db</code>
-Size: {size_mb:.2f} MB
+File: <code>{result['filename']}</code>
+Size: {size_mb:.2f} MB ({raw_mb:.2f} MB uncompressed)
+Integrity: {result['integrity']}
+Pruned: {len(result['pruned'])} old backup(s)
 
 <i>{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</i>"""
 
@@ -0,0 +1,59 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import shared.database.database as database
+from shared.database.database import InternshipListing
+from sqlalchemy import insert
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """Fresh, fully migrated database in a temp directory; yields its engine"""
+    monkeypatch.setattr(database, "get_database_path", lambda: str(tmp_path / "internships.db"))
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_SessionLocal", None)
+    engine, _ = database.init_database()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def add_listings(db):
+    """Insert listing rows (dicts of column values) and return their ids"""
+    def _add(*rows):
+        with database.session_scope() as session:
+            for i, row in enumerate(rows):
+                values = {"title": f"Intern {i}", "company": "Acme", "url": f"https://example.com/{i}", **row}
+                session.execute(insert(InternshipListing), values)
+        with database.session_scope() as session:
+            return [row.id for row in session.query(InternshipListing.id).order_by(InternshipListing.id)]
+    return _add
+
+
+@pytest.fixture
+def throttled_server():
+    """Local server answering every request with 429 and Retry-After: 0"""
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}", hits
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, insert
+
+from shared.database.archive import LISTING_COLUMNS, archive_stale_listings, listings_with_archive
+from shared.database.database import InternshipListing, InternshipListingArchive, session_scope
+from shared.database.stats import get_stats, reconcile_stats
+
+OLD = datetime.utcnow() - timedelta(days=400)
+
+
+def stale(**extra):
+    return {"age_days": 200, "discovered_at": OLD, "application_status": "not_applied", **extra}
+
+
+def fresh(**extra):
+    return {"age_days": 2, "discovered_at": datetime.utcnow(), "application_status": "not_applied", **extra}
+
+
+def rows(session, model):
+    return {row.id: {name: getattr(row, name) for name in LISTING_COLUMNS} for row in session.query(model)}
+
+
+def test_round_trip_keeps_every_column(db, add_listings):
+    add_listings(
+        stale(title="Old Intern", description="kept", relevance_score=12.5, notes="n", scored_with="v1-x"),
+        stale(application_status="applied"),     # never archived
+        stale(application_status="rejected"),
+        fresh(),
+        fresh()                                   # newest row always stays
+    )
+    with session_scope() as session:
+        before = rows(session, InternshipListing)
+
+    assert archive_stale_listings(batch_size=1) == 2
+
+    with session_scope() as session:
+        hot, cold = rows(session, InternshipListing), rows(session, InternshipListingArchive)
+        assert sorted(hot) == [2, 4, 5]
+        assert cold == {listing_id: before[listing_id] for listing_id in (1, 3)}
+
+        listings = listings_with_archive()
+        union = {row.id: row.archived for row in session.execute(select(listings)).all()}
+        assert union == {1: True, 2: False, 3: True, 4: False, 5: False}
+
+
+def test_explicit_zero_thresholds_are_honoured(db, add_listings, monkeypatch):
+    monkeypatch.setenv("ARCHIVE_MAX_AGE_DAYS", "10000")
+    monkeypatch.setenv("ARCHIVE_MAX_DISCOVERED_DAYS", "10000")
+    add_listings(fresh(), fresh(), fresh())
+
+    assert archive_stale_listings() == 0
+    assert archive_stale_listings(max_age_days=0, max_discovered_days=0) == 2
+
+
+def test_reused_id_never_overwrites_an_archived_listing(db, add_listings):
+    add_listings(stale(title="Current"), fresh())
+    with session_scope() as session:
+        session.execute(insert(InternshipListingArchive), {"id": 1, "title": "Archived earlier", "url": "https://example.com/old"})
+
+    assert archive_stale_listings() == 0
+    with session_scope() as session:
+        assert session.get(InternshipListingArchive, 1).title == "Archived earlier"
+        assert session.get(InternshipListing, 1).title == "Current"
+
+
+def test_stats_include_archived_listings(db, add_listings):
+    add_listings(stale(), stale(application_status="rejected"), fresh(application_status="applied"), fresh())
+    with session_scope() as session:
+        before = get_stats(session)
+
+    assert archive_stale_listings() == 2
+    with session_scope() as session:
+        assert get_stats(session) == before
+    assert reconcile_stats() == before
+    assert before["total"] == 4 and before["applied"] == 1
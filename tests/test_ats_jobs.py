@@ -0,0 +1,44 @@
+from sqlalchemy import select
+
+from shared.database.ats_jobs import POLL_MARKER, record_ats_poll
+from shared.database.database import ATSSeenJob, session_scope
+
+
+def job(company, ats_id, url=None):
+    return {'company': company, 'ats_id': ats_id, 'url': url or f"https://boards.example.com/{company}/{ats_id}"}
+
+
+def test_first_poll_seeds_without_alerting(db):
+    new_jobs, removed = record_ats_poll([job("stripe", "1"), job("stripe", "2")], ["stripe"])
+    assert new_jobs == [] and removed == []
+    with session_scope() as session:
+        seen = session.execute(select(ATSSeenJob.ats_id).where(ATSSeenJob.ats_id != POLL_MARKER)).scalars().all()
+    assert sorted(seen) == ["1", "2"]
+
+
+def test_later_polls_report_new_and_removed(db):
+    record_ats_poll([job("stripe", "1"), job("stripe", "2")], ["stripe"])
+
+    new_jobs, removed = record_ats_poll([job("stripe", "2"), job("stripe", "3")], ["stripe"])
+    assert [j['ats_id'] for j in new_jobs] == ["3"]
+    assert [r['ats_id'] for r in removed] == ["1"]
+
+    # A job that comes back isn't new again
+    new_jobs, _ = record_ats_poll([job("stripe", "1"), job("stripe", "2"), job("stripe", "3")], ["stripe"])
+    assert new_jobs == []
+
+
+def test_board_added_later_is_seeded(db):
+    record_ats_poll([job("stripe", "1")], ["stripe"])
+    new_jobs, _ = record_ats_poll([job("stripe", "1"), job("stripe", "2"), job("figma", "9")], ["stripe", "figma"])
+    assert [(j['company'], j['ats_id']) for j in new_jobs] == [("stripe", "2")]
+
+
+def test_jobs_without_ats_id_are_tracked_by_url(db):
+    record_ats_poll([], ["figma"])
+    untracked = job("figma", "", url="https://figma.com/careers/intern")
+
+    new_jobs, _ = record_ats_poll([untracked], ["figma"])
+    assert new_jobs == [untracked]
+    new_jobs, removed = record_ats_poll([untracked], ["figma"])
+    assert new_jobs == [] and removed == []
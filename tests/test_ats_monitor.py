@@ -0,0 +1,97 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from agents.scout.ats_monitor import ATSMonitorTool
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+        self.status_code = 200
+        self.headers = {}
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def monitor(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCOUT_CACHE_DIR", str(tmp_path))
+    tool = ATSMonitorTool()
+    fetched = []
+
+    def get_json(url, label):
+        fetched.append(url.rsplit('/', 1)[-1])
+        return {'content': f"About job {url}", 'departments': [{'name': 'Engineering'}]}
+
+    tool._get_json = get_json
+    tool.fetched = fetched
+    return tool
+
+
+def jobs(*ids, updated_at='2026-10-01'):
+    return [{'company': 'stripe', 'ats_id': ats_id, 'updated_at': updated_at, 'description': '', 'department': ''}
+            for ats_id in ids]
+
+
+def test_hydrate_fetches_every_cache_miss(monitor):
+    first = jobs("1", "2")
+    monitor._hydrate("stripe", first)
+    assert monitor.fetched == ["1", "2"]
+    assert first[0]['department'] == 'Engineering'
+
+    # Cached descriptions are reused; anything missing is fetched, seen before or not
+    second = jobs("1", "2", "3")
+    monitor._hydrate("stripe", second)
+    assert monitor.fetched == ["1", "2", "3"]
+    assert all(job['description'] for job in second)
+
+
+def test_hydrate_refetches_updated_jobs(monitor):
+    monitor._hydrate("stripe", jobs("1"))
+    monitor._hydrate("stripe", jobs("1", updated_at='2026-10-02'))
+    assert monitor.fetched == ["1", "1"]
+
+
+def test_throttled_requests_are_retried_by_the_rate_limiter_only(tmp_path, monkeypatch, throttled_server):
+    url, hits = throttled_server
+    monkeypatch.setenv("SCOUT_CACHE_DIR", str(tmp_path))
+    tool = ATSMonitorTool()
+    tool.max_retries = 1
+
+    assert tool._get_json(url + "/jobs", "stripe") is None
+    assert len(hits) == 2
+    assert tool.rate_limiter.bucket(url).rate == tool.rate_limiter.rate / 2
+
+
+def test_requests_in_flight_are_capped_across_pools(tmp_path, monkeypatch):
+    monkeypatch.setenv("SCOUT_CACHE_DIR", str(tmp_path))
+    monkeypatch.setenv("ATS_MAX_CONCURRENCY", "3")
+    monkeypatch.setenv("ATS_HOST_RATE", "1000")
+    monkeypatch.setenv("ATS_HOST_BURST", "1000")
+    tool = ATSMonitorTool()
+
+    lock = threading.Lock()
+    in_flight, peak = [0], [0]
+
+    def get(url, **kwargs):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        if url.endswith("/jobs"):
+            return FakeResponse({'jobs': [{'id': i, 'title': 'Software Intern', 'updated_at': ''} for i in range(4)]})
+        return FakeResponse({'content': 'About', 'departments': []})
+
+    monkeypatch.setattr(tool, "http", SimpleNamespace(get=get))
+    monkeypatch.setattr(tool, "greenhouse_companies", {f"co{i}": f"https://boards.greenhouse.io/co{i}" for i in range(6)})
+
+    result = tool.execute()
+    assert result["data"]["jobs_found"] == 24
+    assert all(job['description'] for job in result["data"]["jobs"])
+    assert peak[0] == 3
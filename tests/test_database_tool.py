@@ -0,0 +1,75 @@
+from shared.database.database import InternshipListing, InternshipListingArchive, session_scope
+from shared.tools import database as database_tool
+from shared.tools.database import DatabaseTool, DatabaseQueryTool
+from sqlalchemy import insert
+
+
+def listing(i, **extra):
+    return {"title": f"Software Intern {i}", "company": "Acme", "url": f"https://example.com/{i}", **extra}
+
+
+def test_counts_new_and_duplicates(db):
+    DatabaseTool().execute([listing(1)])
+
+    result = DatabaseTool().execute([
+        listing(1),                                    # already stored
+        listing(2),
+        listing(2),                                    # repeated within the batch
+        {**listing(3), "url": "https://example.com/1"},  # same url as an existing row
+        listing(4, title="")                           # incomplete, skipped
+    ])
+
+    assert result["success"]
+    assert result["data"] == {"saved_count": 1, "duplicate_count": 3, "total_processed": 5}
+    with session_scope() as session:
+        assert session.query(InternshipListing).count() == 2
+
+
+def test_title_and_company_match_is_a_duplicate(db):
+    DatabaseTool().execute([listing(1)])
+    result = DatabaseTool().execute([{**listing(1), "url": "https://other.example.com/1"}])
+    assert result["data"]["saved_count"] == 0
+    assert result["data"]["duplicate_count"] == 1
+
+
+def test_archived_listing_is_a_duplicate(db):
+    with session_scope() as session:
+        session.execute(insert(InternshipListingArchive), listing(1))
+
+    result = DatabaseTool().execute([listing(1)])
+    assert result["data"]["saved_count"] == 0
+    assert result["data"]["duplicate_count"] == 1
+
+
+def test_rows_inserted_by_another_process_are_not_counted_as_saved(db, monkeypatch):
+    DatabaseTool().execute([listing(1)])
+
+    # Prefetch misses the row, as if another process inserted it in between
+    monkeypatch.setattr(database_tool, "fetch_existing_keys", lambda session, candidates: (set(), set()))
+    result = DatabaseTool().execute([listing(1), listing(2)])
+
+    assert result["data"]["saved_count"] == 1
+    assert result["data"]["duplicate_count"] == 1
+
+
+def test_save_stream_sums_chunks(db):
+    rows = [listing(i) for i in range(5)] + [listing(0)]
+    result = DatabaseTool().save_stream(iter(rows), chunk_size=2)
+    assert result["data"] == {"saved_count": 5, "duplicate_count": 1, "total_processed": 6}
+
+
+def test_search_returns_the_common_listing_shape(db):
+    DatabaseTool().execute([
+        {**listing(1), "title": "Backend Intern", "description": "python and postgres"},
+        {**listing(2), "title": "Frontend Intern", "description": "react"},
+        {**listing(3), "title": "Python Platform Intern", "description": "python tooling"},
+    ])
+    recent = DatabaseQueryTool().execute(action="recent")["data"]["internships"]
+    found = DatabaseQueryTool().execute(action="search", query="python")["data"]
+
+    assert found["count"] == 2
+    # Title hits rank above description-only hits
+    assert [hit["title"] for hit in found["internships"]] == ["Python Platform Intern", "Backend Intern"]
+    for hit in found["internships"]:
+        assert set(hit) == set(recent[0]) | {"snippet"}
+        assert "[python]" in hit["snippet"].lower()
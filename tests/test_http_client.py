@@ -0,0 +1,39 @@
+from types import SimpleNamespace
+
+from shared.tools.http_client import HTTPClient
+
+URL = "https://api.example.com/search"
+
+
+def test_cache_key_normalises_params():
+    key = HTTPClient._cache_key
+    assert key(URL, {"params": {"q": "intern", "tag": ["a", "b"]}}) == key(URL, {"params": [("tag", "a"), ("q", "intern"), ("tag", "b")]})
+    assert key(URL, {"params": {"tag": ["a", "b"]}}) == key(URL, {"params": "tag=b&tag=a"})
+    assert key(URL, {"params": {"tag": ["a", "b"]}}) != key(URL, {"params": {"tag": ["a"]}})
+    assert key(URL, {"params": {"tag": "a b"}}) != key(URL, {"params": {"tag": ["a", "b"]}})
+
+
+def test_cached_get_with_list_params():
+    client = HTTPClient()
+    calls = []
+
+    def request(method, url, timeout=None, **kwargs):
+        calls.append(kwargs["params"])
+        return SimpleNamespace(status_code=200, content=b"{}")
+
+    client.session = lambda url: SimpleNamespace(request=request)
+
+    client.get(URL, params={"tag": ["a", "b"]}, cache_ttl=60)
+    client.get(URL, params=[("tag", "a"), ("tag", "b")], cache_ttl=60)
+    client.get(URL, params={"tag": ["b"]}, cache_ttl=60)
+    assert len(calls) == 2
+
+
+def test_retry_after_can_be_left_to_the_caller(throttled_server):
+    url, hits = throttled_server
+    assert HTTPClient(retries=2, backoff=0, retry_statuses=(500,)).get(url + "/a").status_code == 429
+    assert len(hits) == 3  # urllib3 retries a 429 with Retry-After even when it isn't listed
+
+    hits.clear()
+    assert HTTPClient(retries=2, backoff=0, retry_statuses=(500,), retry_after=False).get(url + "/b").status_code == 429
+    assert len(hits) == 1
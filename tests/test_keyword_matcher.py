@@ -0,0 +1,35 @@
+from agents.analyzer.resume_matcher import SKILL_VOCABULARY
+from agents.scout.ats_monitor import INTERNSHIP_KEYWORDS
+from shared.tools.keyword_matcher import KeywordMatcher
+
+
+def test_whole_words_only():
+    matcher = KeywordMatcher(["intern", "fall", "go", "c++"])
+    assert matcher.matches("Fall 2026 Intern, C++") == {"fall", "intern", "c++"}
+    assert matcher.matches("Waterfall Internal Google") == set()
+    assert matcher.matches("Interns: it goes like this at Niagara Falls") == set()
+    assert matcher.matches("Summer2026") == set()
+
+
+def test_plurals_are_opt_in():
+    assert KeywordMatcher(["intern"], plurals=True).matches("Interns") == {"intern"}
+    assert KeywordMatcher(["intern"]).matches("Interns") == set()
+
+
+def test_digits_count_as_boundaries():
+    matcher = KeywordMatcher(["summer", "intern"], digits=True)
+    assert matcher.matches("Summer2026 SWE") == {"summer"}
+    assert matcher.matches("2026Intern") == {"intern"}
+    assert matcher.matches("Internal_summer") == set()
+
+
+def test_internship_titles():
+    titles = ["Summer2026 Software Engineer", "Undergraduate Researcher", "Waterfall Platform Engineer",
+              "Software Engineering Interns", "Niagara Falls Site Manager"]
+    assert INTERNSHIP_KEYWORDS.filter(titles) == [0, 1, 3]
+
+
+def test_skill_vocabulary_has_no_plural_suffix():
+    skills = KeywordMatcher(SKILL_VOCABULARY)
+    assert skills.matches("Node and Express: it goes through our res folder") == {"node", "express"}
+    assert skills.matches("nodes expresses goes res") == set()
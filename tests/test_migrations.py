@@ -0,0 +1,123 @@
+import sqlite3
+
+from sqlalchemy import event
+
+import shared.database.database as database
+from shared.database.migrations import MIGRATIONS, get_schema_version, run_migrations
+from shared.tools.database import fetch_existing_keys
+
+LATEST = MIGRATIONS[-1][0]
+
+# internship_listings as created before age_days and the migrations existed
+PRE_MIGRATION_SCHEMA = """
+CREATE TABLE internship_listings (
+    id INTEGER PRIMARY KEY, agent_job_id VARCHAR, title VARCHAR, company VARCHAR,
+    url VARCHAR UNIQUE, location VARCHAR, description TEXT, requirements TEXT,
+    deadline VARCHAR, salary_min FLOAT, salary_max FLOAT, discovered_at DATETIME,
+    applied BOOLEAN, application_date DATETIME, application_status VARCHAR,
+    notes TEXT, relevance_score FLOAT, interest_level INTEGER
+)
+"""
+
+
+def columns(conn, table):
+    return {row[1] for row in conn.exec_driver_sql(f"PRAGMA table_info({table})")}
+
+
+def names(conn, kind):
+    return {row[0] for row in conn.exec_driver_sql("SELECT name FROM sqlite_master WHERE type = ?", (kind,))}
+
+
+def test_fresh_database_is_at_latest_version(db):
+    with db.begin() as conn:
+        assert get_schema_version(conn) == LATEST
+        assert {"age_days", "scored_with"} <= columns(conn, "internship_listings")
+        assert "scored_with" in columns(conn, "internship_listings_archive")
+        assert {"internship_listings_fts", "listing_stats"} <= names(conn, "table")
+        assert {"listing_stats_ai", "listing_stats_ad", "listing_stats_au", "listing_stats_archive_ai",
+                "internship_listings_fts_ai", "internship_listings_fts_ad", "internship_listings_fts_au"} <= names(conn, "trigger")
+        assert "ix_internship_listings_scored_with" in names(conn, "index")
+
+
+def test_archive_duplicate_check_uses_indexes(db):
+    plans = []
+
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        if "internship_listings_archive" in statement:
+            plans.extend(row[3] for row in cursor.connection.execute("EXPLAIN QUERY PLAN " + statement, parameters))
+
+    event.listen(db, "before_cursor_execute", explain)
+    try:
+        with database.session_scope() as session:
+            fetch_existing_keys(session, [{"url": "https://example.com/1", "title": "Intern", "company": "Acme"}])
+    finally:
+        event.remove(db, "before_cursor_execute", explain)
+
+    assert plans and not any(plan.startswith("SCAN") for plan in plans)
+
+
+def test_migrations_run_once(db):
+    assert run_migrations(db) == []
+
+
+def test_upgrade_from_pre_migration_database(tmp_path, monkeypatch):
+    path = tmp_path / "internships.db"
+    conn = sqlite3.connect(path)
+    conn.execute(PRE_MIGRATION_SCHEMA)
+    conn.executemany(
+        "INSERT INTO internship_listings (title, company, url, description, discovered_at, application_status, relevance_score) "
+        "VALUES (?, ?, ?, ?, '2026-01-05 10:00:00', ?, ?)",
+        [
+            ("Backend Intern", "Acme", "https://example.com/1", "python services", "applied", 42.0),
+            ("Data Intern", "Globex", "https://example.com/2", "sql", "not_applied", 0.0),
+        ]
+    )
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(database, "get_database_path", lambda: str(path))
+    monkeypatch.setattr(database, "_engine", None)
+    monkeypatch.setattr(database, "_SessionLocal", None)
+    engine, _ = database.init_database()
+
+    with engine.begin() as conn:
+        assert get_schema_version(conn) == LATEST
+        assert {"age_days", "scored_with"} <= columns(conn, "internship_listings")
+
+        # FTS index and stats counters are built from the existing rows
+        hits = conn.exec_driver_sql(
+            "SELECT rowid FROM internship_listings_fts WHERE internship_listings_fts MATCH 'python'"
+        ).all()
+        assert [row[0] for row in hits] == [1]
+        stats = dict(conn.exec_driver_sql("SELECT key, value FROM listing_stats").all())
+        assert stats["total"] == 2
+        assert stats["status:applied"] == 1
+        assert stats["day:2026-01-05"] == 2
+
+        # Previously scored rows are stale, unscored ones are new
+        scored_with = dict(conn.exec_driver_sql("SELECT id, scored_with FROM internship_listings").all())
+        assert scored_with == {1: "legacy", 2: None}
+    engine.dispose()
+
+
+def test_fts_and_stats_follow_row_changes(db):
+    with db.begin() as conn:
+        conn.exec_driver_sql(
+            "INSERT INTO internship_listings (title, company, url, description, discovered_at, application_status) "
+            "VALUES ('ML Intern', 'Acme', 'u1', 'pytorch', '2026-02-01 09:00:00', 'not_applied')"
+        )
+        conn.exec_driver_sql("UPDATE internship_listings SET description = 'tensorflow', application_status = 'applied'")
+
+    with db.begin() as conn:
+        match = lambda term: conn.exec_driver_sql(
+            "SELECT count(*) FROM internship_listings_fts WHERE internship_listings_fts MATCH ?", (term,)
+        ).scalar()
+        assert match("pytorch") == 0
+        assert match("tensorflow") == 1
+        stats = dict(conn.exec_driver_sql("SELECT key, value FROM listing_stats").all())
+        assert stats["status:applied"] == 1
+        assert stats.get("status:not_applied", 0) == 0
+
+        conn.exec_driver_sql("DELETE FROM internship_listings")
+        assert match("tensorflow") == 0
+        assert conn.exec_driver_sql("SELECT value FROM listing_stats WHERE key = 'total'").scalar() == 0
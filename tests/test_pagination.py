@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+
+from shared.database.database import InternshipListing, session_scope
+from shared.database.pagination import SORTS, decode_cursor, encode_cursor, paginate
+
+ROWS = [
+    {"relevance_score": 50.0, "age_days": 3, "company": "Globex", "discovered_at": datetime(2026, 3, 1)},
+    {"relevance_score": None, "age_days": None, "company": None, "discovered_at": None},
+    {"relevance_score": 50.0, "age_days": 3, "company": "Acme", "discovered_at": datetime(2026, 3, 1)},
+    {"relevance_score": 80.0, "age_days": 1, "company": "Initech", "discovered_at": datetime(2026, 3, 5)},
+    {"relevance_score": None, "age_days": None, "company": None, "discovered_at": None},
+    {"relevance_score": 0.0, "age_days": 10, "company": "Acme", "discovered_at": datetime(2026, 1, 1)},
+    {"relevance_score": 50.0, "age_days": 0, "company": "Hooli", "discovered_at": datetime(2026, 3, 1)},
+]
+
+
+def expected_order(listings, sort):
+    """Ids in sort order: keys in the sort's direction then id, NULL keys last"""
+    name, descending, _ = SORTS[sort]
+    present = [l for l in listings if getattr(l, name) is not None]
+    missing = [l for l in listings if getattr(l, name) is None]
+    key = lambda l: (getattr(l, name), l.id)
+    return [l.id for l in sorted(present, key=key, reverse=descending)] + \
+           [l.id for l in sorted(missing, key=lambda l: l.id, reverse=descending)]
+
+
+@pytest.mark.parametrize("sort", sorted(SORTS))
+@pytest.mark.parametrize("limit", [1, 2, 3, 50])
+def test_pages_cover_every_row_once_in_order(db, add_listings, sort, limit):
+    add_listings(*ROWS)
+
+    seen, cursor = [], None
+    with session_scope() as session:
+        while True:
+            rows, cursor = paginate(session.query(InternshipListing), sort=sort, limit=limit, cursor=cursor)
+            assert len(rows) <= limit
+            seen.extend(row.id for row in rows)
+            if cursor is None:
+                break
+        expected = expected_order(session.query(InternshipListing).all(), sort)
+
+    assert seen == expected
+
+
+def test_cursor_round_trip_and_validation(db, add_listings):
+    add_listings(*ROWS)
+    with session_scope() as session:
+        row = session.query(InternshipListing).filter(InternshipListing.discovered_at.isnot(None)).first()
+        cursor = encode_cursor("date", row)
+        assert decode_cursor(cursor, "date") == (row.discovered_at, row.id)
+
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, "company")
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor", "date")
@@ -0,0 +1,76 @@
+import pytest
+
+from shared.tools import rate_limit
+from shared.tools.rate_limit import HostRateLimiter, TokenBucket, parse_retry_after
+
+
+class FakeClock:
+    """Stands in for the time module: sleep() just moves monotonic() forward"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limit, "time", clock)
+    return clock
+
+
+def test_burst_then_steady_rate(clock):
+    bucket = TokenBucket(rate=2, burst=3)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.now == 1000.0
+
+    bucket.acquire()
+    assert clock.now == pytest.approx(1000.5)
+
+
+def test_backoff_pauses_and_halves_the_rate(clock):
+    bucket = TokenBucket(rate=4, burst=1)
+    bucket.backoff(5)
+    assert bucket.rate == 2
+
+    bucket.acquire()
+    assert clock.now == pytest.approx(1005.5)  # Paused 5 s, then one token at the halved rate
+    bucket.acquire()
+    assert clock.now == pytest.approx(1006.0)
+
+
+def test_success_recovers_to_the_configured_rate(clock):
+    bucket = TokenBucket(rate=10, burst=1, min_rate=1)
+    for _ in range(10):
+        bucket.backoff(0)
+    assert bucket.rate == 1  # Never below min_rate
+
+    for _ in range(9):
+        bucket.success()
+    assert bucket.rate == pytest.approx(10)
+    bucket.success()
+    assert bucket.rate == 10
+
+
+def test_hosts_back_off_independently(clock):
+    limiter = HostRateLimiter(rate=2, burst=1)
+    limiter.backoff("https://boards-api.greenhouse.io/v1/boards/stripe/jobs", 30)
+
+    limiter.acquire("https://api.lever.co/v0/postings/figma")
+    assert clock.now == 1000.0
+    assert limiter.bucket("https://boards-api.greenhouse.io/v1/boards/reddit/jobs").rate == 1
+    assert limiter.bucket("https://api.lever.co/").rate == 2
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("-1") == 0.0
+    assert parse_retry_after(None, default=2) == 2
+    assert parse_retry_after("soon", default=2) == 2
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
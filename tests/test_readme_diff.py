@@ -0,0 +1,60 @@
+from agents.scout.readme_diff import ReadmeSnapshotStore, diff_readme, select_listings
+from agents.scout.readme_parser import get_parser
+
+URL = "https://raw.githubusercontent.com/example/internships/dev/README.md"
+
+
+def html_row(i, age="3d"):
+    return (f'<tr>\n<td><strong><a href="https://simplify.jobs/c/co{i}">Company {i}</a></strong></td>\n'
+            f'<td>Intern {i}</td>\n<td>Remote</td>\n'
+            f'<td><div align="center"><a href="https://jobs.example.com/{i}"><img src="apply.png" alt="Apply"></a>'
+            f'</div></td>\n<td>{age}</td>\n</tr>\n')
+
+
+def markdown_row(i):
+    return f'| [Company {i}](https://c{i}.com) | Intern {i} | Remote | [Apply](https://apply.example.com/{i}) |\n'
+
+
+def readme(*rows):
+    return "# Internships\n\n<table>\n" + "".join(rows) + "</table>\n"
+
+
+def test_diff_reports_added_and_removed_rows():
+    rows, added, removed = diff_readme(readme(html_row(1), html_row(2)), [])
+    assert [listing["company"] for listing in added] == ["Company 1", "Company 2"]
+    assert removed == []
+
+    rows, added, removed = diff_readme(readme(html_row(2), html_row(3)), rows)
+    assert [listing["company"] for listing in added] == ["Company 3"]
+    assert [listing["company"] for listing in removed] == ["Company 1"]
+    assert [listing["url"] for listing in select_listings([p for _, p in rows], {"html"})] == [
+        "https://jobs.example.com/2", "https://jobs.example.com/3"
+    ]
+
+
+def test_rows_failing_late_are_skipped():
+    content = readme(html_row(1, age="Oct 01"), html_row(2), markdown_row(3))
+    rows, added, _ = diff_readme(content, [])
+    assert [(listing["company"], listing["format"]) for listing in added] == [
+        ("Company 2", "html"), ("Company 3", "markdown")
+    ]
+    assert added[0]["age_days"] == "3"
+
+
+def test_parser_type_selects_formats():
+    content = readme(html_row(1)) + markdown_row(2)
+    _, html_only, _ = diff_readme(content, [], get_parser("html_table"))
+    _, markdown_only, _ = diff_readme(content, [], get_parser("markdown_table"))
+    assert [listing["format"] for listing in html_only] == ["html"]
+    assert [listing["format"] for listing in markdown_only] == ["markdown"]
+
+
+def test_snapshots_are_kept_per_parser(tmp_path):
+    store = ReadmeSnapshotStore(str(tmp_path))
+    rows, _, _ = diff_readme(readme(html_row(1)), [], get_parser("html_table"))
+    store.save(URL, rows, "key-html", "html_table")
+
+    assert store.load(URL, "html_table") == [tuple(row) for row in rows]
+    assert store.last_key(URL, "html_table") == "key-html"
+    assert store.load(URL, "auto") == []
+    assert store.last_key(URL, "auto") is None
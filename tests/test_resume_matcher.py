@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+from agents.analyzer import scoring
+from agents.analyzer.resume_matcher import ResumeMatcher
+from shared.database.database import InternshipListing, session_scope
+
+
+@pytest.fixture
+def resume(tmp_path):
+    path = tmp_path / "resume.txt"
+    path.write_text("Python, AWS and Docker")
+    return path
+
+
+def scores(session):
+    return {row.id: (row.relevance_score, row.scored_with) for row in session.query(InternshipListing)}
+
+
+def test_scoring_runs_outside_the_writer_thread(db, add_listings, resume, monkeypatch):
+    add_listings({"title": "Python Intern"}, {"title": "Docker Intern", "company": "Google"})
+
+    threads = []
+    score = scoring.ScoringEngine.score
+
+    def recording_score(self, *args):
+        threads.append(threading.current_thread().name)
+        return score(self, *args)
+
+    monkeypatch.setattr(scoring.ScoringEngine, "score", recording_score)
+    result = ResumeMatcher(resume_path=str(resume)).execute()
+
+    assert result["data"]["scored_count"] == 2
+    assert threads and "db-writer" not in threads
+    with session_scope() as session:
+        assert all(score > 0 for score, _ in scores(session).values())
+
+
+def test_resume_change_rescores_stale_listings(db, add_listings, resume):
+    add_listings({"title": "Python Intern"}, {"title": "Java Intern"}, {"title": "Unscored Intern"})
+    first = ResumeMatcher(resume_path=str(resume))
+    first.execute()
+    with session_scope() as session:
+        session.query(InternshipListing).filter(InternshipListing.title == "Unscored Intern").update({"scored_with": None})
+
+    result = first.execute(background=False)
+    assert result["data"]["scored_count"] == 1 and not result["data"]["rescoring"]
+
+    resume.write_text("Java and Kubernetes")
+    second = ResumeMatcher(resume_path=str(resume))
+    result = second.execute(background=False)
+    assert result["data"]["scored_count"] == 0 and result["data"]["rescoring"]
+    assert second.engine.fingerprint != first.engine.fingerprint
+    with session_scope() as session:
+        assert {fingerprint for _, fingerprint in scores(session).values()} == {second.engine.fingerprint}
+
+
+def test_background_rescore_outlives_the_caller(db, add_listings, resume):
+    add_listings({"title": "Python Intern"})
+    ResumeMatcher(resume_path=str(resume)).execute()
+
+    resume.write_text("Java")
+    matcher = ResumeMatcher(resume_path=str(resume))
+    thread = matcher.rescore_stale(background=True)
+    assert not thread.daemon  # The interpreter waits for it before exiting
+    thread.join()
+    with session_scope() as session:
+        assert {fingerprint for _, fingerprint in scores(session).values()} == {matcher.engine.fingerprint}
+
+
+def test_routine_runs_only_prune_when_due(db, add_listings, resume, monkeypatch):
+    ids = add_listings({"title": "Python Intern"}, {"title": "Java Intern"})
+    matcher = ResumeMatcher(resume_path=str(resume))
+    retained = []
+    monkeypatch.setattr(matcher.engine, "retain", lambda live_ids: retained.append(sorted(live_ids)))
+
+    monkeypatch.setattr(matcher.engine, "should_retain", lambda: False)
+    matcher.execute()
+    assert retained == []
+
+    with session_scope() as session:
+        session.query(InternshipListing).filter(InternshipListing.id == ids[0]).delete()
+    monkeypatch.setattr(matcher.engine, "should_retain", lambda: True)
+    matcher.execute()
+    assert retained == [ids[1:]]
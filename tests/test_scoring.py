@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from agents.analyzer.scoring import ScoringEngine, ScoringProfile, TermMatrix
+
+VOCABULARY = ("api", "go", "python", "rest api", "sql")
+
+
+def terms(matrix, ids):
+    """Matched terms per id, read back from the sparse rows"""
+    rows = matrix.rows(ids)
+    return [{matrix.terms[column] for column in rows[i].indices} for i in range(len(ids))]
+
+
+@pytest.fixture
+def matrix():
+    matrix = TermMatrix(VOCABULARY)
+    matrix.COMPACT_MIN_DEAD = 2
+    return matrix
+
+
+def test_update_and_rows_interleaved(matrix):
+    matrix.update([1, 2], ["Python intern", "Go and SQL"])
+    assert terms(matrix, [2, 1]) == [{"go", "sql"}, {"python"}]
+
+    # New text for 1, a new listing 3, and rows read between updates
+    matrix.update([1, 3], ["REST API work", "sql"])
+    assert terms(matrix, [1, 2, 3]) == [{"rest api", "api"}, {"go", "sql"}, {"sql"}]
+    matrix.update([2], ["Go and SQL"])  # Unchanged text: no new row
+    assert len(matrix) == 4
+
+
+def test_retain_drops_listings_and_compacts(matrix):
+    matrix.update(range(6), ["python", "go", "sql", "api", "python sql", "go"])
+    assert matrix.retain([4, 5]) == 4
+    assert len(matrix) == 2  # 4 dead rows > max(2, 2 live): rebuilt
+    assert terms(matrix, [5, 4]) == [{"go"}, {"python", "sql"}]
+
+    with pytest.raises(KeyError):
+        matrix.rows([0])
+
+
+def test_changed_text_is_compacted(matrix):
+    matrix.update([1], ["python"])
+    for text in ["go", "sql", "api"]:
+        matrix.update([1], [text])
+    assert len(matrix) == 1
+    assert terms(matrix, [1]) == [{"api"}]
+
+
+def test_scores_survive_compaction(monkeypatch):
+    engine = ScoringEngine(["python", "sql"], ["api"], ["acme"], vocabulary=VOCABULARY, profile=ScoringProfile())
+    monkeypatch.setattr(engine.text_terms, "COMPACT_MIN_DEAD", 0)
+    monkeypatch.setattr(engine.company_terms, "COMPACT_MIN_DEAD", 0)
+    ids, texts, companies = [10, 11, 12], ["python api", "sql", "go"], ["Acme", "Other", "Acme"]
+
+    before = engine.score(ids, texts, companies)
+    engine.score([96, 97, 98, 99], ["python sql api"] * 4, ["Other"] * 4)
+    assert engine.retain(ids) == 4
+    assert len(engine.text_terms) == 3
+    assert np.array_equal(engine.score(ids, texts, companies), before)
+
+
+def test_score_does_not_depend_on_other_listings():
+    engine = ScoringEngine(["python", "sql"], ["api"], ["acme"], vocabulary=VOCABULARY, profile=ScoringProfile())
+    alone = engine.score([20], ["python api"], ["Acme"])
+    engine.score(list(range(100, 200)), ["python sql"] * 100, ["Other"] * 100)
+    assert np.array_equal(engine.score([20], ["python api"], ["Acme"]), alone)
+
+
+def test_retain_is_due_once_the_matrix_doubles(matrix):
+    matrix.update(range(3), ["python"] * 3)
+    assert matrix.should_retain()  # 3 > max(2, 0)
+    matrix.retain(range(3))
+    matrix.update(range(3, 6), ["go"] * 3)
+    assert not matrix.should_retain()  # 6 is only twice the 3 kept
+    matrix.update([6], ["sql"])
+    assert matrix.should_retain()